@@ -0,0 +1,88 @@
+"""Peak memory of decoding a compressed bundle into its inner packets.
+
+Compares decompressing the whole bundle at once with `Packet.iter_packets`.
+
+    python benchmarks/bundle_decode.py
+"""
+
+from __future__ import annotations
+
+import json
+import time
+import tracemalloc
+import zlib
+
+from nonebot.adapters.bilibili_live.packet import (
+    HEADER_LENGTH,
+    OpCode,
+    Packet,
+    ProtocolVersion,
+)
+
+import brotli
+
+SIZES = (10, 100, 500, 2000)
+
+BODY = json.dumps(
+    {"cmd": "DANMU_MSG", "info": [[0, 1, 25, 16777215], "hello" * 40]}
+).encode()
+
+
+def make_bundle(count: int, version: ProtocolVersion) -> Packet:
+    raw = Packet.new_binary(OpCode.Command, 0, BODY).to_bytes() * count
+    compressed = (
+        brotli.compress(raw)
+        if version == ProtocolVersion.Brotli
+        else zlib.compress(raw)
+    )
+    return Packet.new_binary(OpCode.Command, 0, compressed, version)
+
+
+def whole_bundle(packet: Packet) -> int:
+    """Decompress everything, then split, as `decode_data` used to."""
+    if packet.protocol_version == ProtocolVersion.Brotli:
+        data = brotli.decompress(packet.data)
+    else:
+        data = zlib.decompress(packet.data)
+    packets = []
+    offset = 0
+    while len(data) - offset >= HEADER_LENGTH:
+        length = int.from_bytes(data[offset : offset + 4], "big")
+        packets.append(Packet.from_bytes(data[offset : offset + length]))
+        offset += length
+    return sum(len(p.data) for p in packets)
+
+
+def streaming(packet: Packet) -> int:
+    return sum(len(p.data) for p in packet.iter_packets())
+
+
+def measure(func, packet: Packet) -> tuple[int, float]:
+    tracemalloc.start()
+    func(packet)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    start = time.perf_counter()
+    func(packet)
+    return peak, time.perf_counter() - start
+
+
+def main() -> None:
+    print(f"inner packet size: {len(BODY) + HEADER_LENGTH} bytes")
+    print(
+        f"{'codec':>7} {'packets':>8} {'whole peak':>11} {'whole ms':>9} "
+        f"{'stream peak':>12} {'stream ms':>10}"
+    )
+    for version in (ProtocolVersion.Zlib, ProtocolVersion.Brotli):
+        for size in SIZES:
+            packet = make_bundle(size, version)
+            whole_peak, whole_time = measure(whole_bundle, packet)
+            stream_peak, stream_time = measure(streaming, packet)
+            print(
+                f"{version.name:>7} {size:>8} {whole_peak:>11} "
+                f"{whole_time * 1e3:>9.2f} {stream_peak:>12} {stream_time * 1e3:>10.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
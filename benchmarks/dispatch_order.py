@@ -0,0 +1,62 @@
+"""Dispatch throughput of ordered vs. unordered mode.
+
+Every handler awaits for a short while to stand in for plugin I/O; the
+ordered run also checks that each room saw its events in arrival order.
+
+    python benchmarks/dispatch_order.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from nonebot.adapters.bilibili_live.dispatch import Dispatcher
+from nonebot.adapters.bilibili_live.event import OnlineRankCountEvent
+
+WORKERS = 16
+EVENTS_PER_ROOM = 200
+HANDLER_DELAY = 0.001
+
+
+class RecordingBot:
+    def __init__(self, total: int) -> None:
+        self.seen: dict[int, list[int]] = {}
+        self.remaining = total
+        self.done = asyncio.Event()
+
+    async def _handle_event(self, event: OnlineRankCountEvent) -> None:
+        await asyncio.sleep(HANDLER_DELAY)
+        self.seen.setdefault(event.room_id, []).append(event.count)
+        self.remaining -= 1
+        if not self.remaining:
+            self.done.set()
+
+
+async def run(rooms: int, ordered: bool) -> tuple[float, bool]:
+    dispatcher = Dispatcher(WORKERS, EVENTS_PER_ROOM, "block", ordered=ordered)
+    dispatcher.start()
+    total = rooms * EVENTS_PER_ROOM
+    bot = RecordingBot(total)
+    start = time.perf_counter()
+    for index in range(EVENTS_PER_ROOM):
+        for room_id in range(rooms):
+            event = OnlineRankCountEvent(room_id=room_id, data={"count": index})
+            await dispatcher.put(bot, event, room_id)  # pyright: ignore[reportArgumentType]
+    await bot.done.wait()
+    elapsed = time.perf_counter() - start
+    await dispatcher.stop()
+    in_order = all(seen == sorted(seen) for seen in bot.seen.values())
+    return total / elapsed, in_order
+
+
+async def main() -> None:
+    print(f"{'rooms':>6} {'unordered ev/s':>15} {'ordered ev/s':>13} {'in order':>9}")
+    for rooms in (1, 4, 16, 64):
+        unordered, _ = await run(rooms, ordered=False)
+        ordered, in_order = await run(rooms, ordered=True)
+        print(f"{rooms:>6} {unordered:>15.0f} {ordered:>13.0f} {in_order!s:>9}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""Dispatch latency per event class while the workers are saturated.
+
+A like storm is mixed with a few gifts and super chats; the run is repeated
+with every event at the same priority for comparison.
+
+    python benchmarks/dispatch_priority.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+from nonebot.adapters.bilibili_live.dispatch import Dispatcher, PriorityName
+from nonebot.adapters.bilibili_live.event import Event, packet_to_event
+from nonebot.adapters.bilibili_live.packet import OpCode, Packet
+
+from payloads import PAYLOADS, ROOM_ID, encode
+
+WORKERS = 4
+EVENTS = 4_000
+PAID_RATIO = 0.02
+HANDLER_DELAY = 0.0005
+
+
+def load(cmd: str) -> Event:
+    packet = Packet.new_binary(OpCode.Command, 0, encode(PAYLOADS[cmd]))
+    event = packet_to_event(packet, ROOM_ID)
+    assert event is not None
+    return event
+
+
+class SlowBot:
+    def __init__(self) -> None:
+        self.remaining = EVENTS
+        self.done = asyncio.Event()
+
+    async def _handle_event(self, event: Event) -> None:
+        await asyncio.sleep(HANDLER_DELAY)
+        self.remaining -= 1
+        if not self.remaining:
+            self.done.set()
+
+
+async def run(priorities: dict[str, PriorityName] | None) -> dict[str, dict]:
+    dispatcher = Dispatcher(WORKERS, EVENTS, "block", priorities=priorities)
+    dispatcher.start()
+    bot = SlowBot()
+    rng = random.Random(0)
+    like, gift, super_chat = (
+        load("LIKE_INFO_V3_CLICK"),
+        load("SEND_GIFT"),
+        load("SUPER_CHAT_MESSAGE"),
+    )
+    for index in range(EVENTS):
+        if rng.random() < PAID_RATIO:
+            event = gift if index % 2 else super_chat
+        else:
+            event = like
+        await dispatcher.put(bot, event, ROOM_ID)  # pyright: ignore[reportArgumentType]
+        if index % 50 == 0:
+            await asyncio.sleep(0)
+    await bot.done.wait()
+    await dispatcher.stop()
+    return dispatcher.latency_percentiles()
+
+
+async def main() -> None:
+    flat: dict[str, PriorityName] = dict.fromkeys(
+        ("LikeEvent", "SendGiftEvent", "SuperChatEvent"), "normal"
+    )
+    for title, priorities in (("all normal", flat), ("default priorities", None)):
+        print(f"{title} (ms)")
+        print(f"  {'event':<16} {'p50':>8} {'p90':>8} {'p99':>8}")
+        for name, values in sorted((await run(priorities)).items()):
+            cells = " ".join(f"{values[p] * 1e3:>8.1f}" for p in (50, 90, 99))
+            print(f"  {name:<16} {cells}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
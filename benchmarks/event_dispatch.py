@@ -0,0 +1,63 @@
+"""Validation time per command: `Union` trial validation vs. routed dispatch.
+
+python benchmarks/event_dispatch.py
+"""
+
+from __future__ import annotations
+
+import copy
+import timeit
+from typing import Any, Union
+
+from nonebot.adapters.bilibili_live.event import COMMAND_TO_EVENT
+
+from nonebot.compat import type_validate_python
+from payloads import PAYLOADS, ROOM_ID
+
+NUMBER = 2_000
+
+
+def variant(cmd: str, **data: Any) -> dict[str, Any]:
+    payload = copy.deepcopy(PAYLOADS[cmd])
+    payload["data"].update(data)
+    return payload
+
+
+CASES: dict[str, dict[str, Any]] = {
+    "DANMU_MSG": PAYLOADS["DANMU_MSG"],
+    "LIVE_OPEN_PLATFORM_DM": PAYLOADS["LIVE_OPEN_PLATFORM_DM"],
+    "SEND_GIFT": PAYLOADS["SEND_GIFT"],
+    "LIVE_OPEN_PLATFORM_SEND_GIFT": PAYLOADS["LIVE_OPEN_PLATFORM_SEND_GIFT"],
+    "INTERACT_WORD (enter)": PAYLOADS["INTERACT_WORD"],
+    "INTERACT_WORD (follow)": variant("INTERACT_WORD", msg_type=2),
+    "INTERACT_WORD (share)": variant("INTERACT_WORD", msg_type=3),
+    "DM_INTERACTION (danmaku)": PAYLOADS["DM_INTERACTION"],
+}
+
+
+def main() -> None:
+    print(f"{'cmd (us/event)':<30} {'models':>6} {'union':>9} {'routed':>9}")
+    for name, payload in CASES.items():
+        data = {**payload, "room_id": ROOM_ID}
+        route = COMMAND_TO_EVENT[payload["cmd"]]
+        models = tuple(route.models.values())
+        union = Union[models] if len(models) > 1 else models[0]
+
+        def before() -> None:
+            type_validate_python(union, copy.deepcopy(data))
+
+        def after() -> None:
+            model = route.resolve(data)
+            assert model is not None
+            type_validate_python(model, copy.deepcopy(data))
+
+        before_time = timeit.timeit(before, number=NUMBER) / NUMBER
+        after_time = timeit.timeit(after, number=NUMBER) / NUMBER
+        print(
+            f"{name:<30} {len(models):>6} {before_time * 1e6:>9.1f} "
+            f"{after_time * 1e6:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
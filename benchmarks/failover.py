@@ -0,0 +1,109 @@
+"""Danmaku lost while a mock server keeps killing room connections.
+
+A local TCP server broadcasts numbered command packets to every client and
+closes a random client connection at a fixed interval. A single connection
+is compared with two redundant ones deduplicated through `RoomMirror`.
+
+    python benchmarks/failover.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+
+from nonebot.adapters.bilibili_live.mirror import RoomMirror
+from nonebot.adapters.bilibili_live.packet import (
+    HEADER_LENGTH,
+    OpCode,
+    Packet,
+    split_frame,
+)
+
+TICK = 0.002
+KILL_INTERVAL = 1.0
+RECONNECT_DELAY = 0.25
+DURATION = 6.0
+
+
+class MockServer:
+    def __init__(self) -> None:
+        self.writers: list[asyncio.StreamWriter] = []
+        self.sent = 0
+
+    async def handle(self, _: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.writers.append(writer)
+
+    async def broadcast(self) -> None:
+        while True:
+            body = json.dumps({"cmd": "DANMU_MSG", "seq": self.sent}).encode()
+            frame = Packet.new_binary(OpCode.Command, 0, body).to_bytes()
+            self.sent += 1
+            for writer in list(self.writers):
+                writer.write(frame)
+            await asyncio.sleep(TICK)
+
+    async def kill(self, rng: random.Random) -> None:
+        while True:
+            await asyncio.sleep(KILL_INTERVAL)
+            if self.writers:
+                writer = self.writers.pop(rng.randrange(len(self.writers)))
+                writer.close()
+
+
+async def client(port: int, received: list[int], mirror: RoomMirror | None, index: int):
+    link = mirror.link(index) if mirror else None
+    while True:
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(RECONNECT_DELAY)
+            continue
+        try:
+            while True:
+                header = await reader.readexactly(HEADER_LENGTH)
+                length = int.from_bytes(header[:4], "big")
+                frame = header + await reader.readexactly(length - HEADER_LENGTH)
+                for packet in split_frame(frame):
+                    if link is None or link.accept(packet):
+                        received.append(json.loads(bytes(packet.data))["seq"])
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+        await asyncio.sleep(RECONNECT_DELAY)
+
+
+async def run(connections: int) -> tuple[int, int, int]:
+    server = MockServer()
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    received: list[int] = []
+    mirror = RoomMirror() if connections > 1 else None
+    tasks = [
+        asyncio.create_task(client(port, received, mirror, index))
+        for index in range(connections)
+    ]
+    await asyncio.sleep(0.1)
+    tasks.append(asyncio.create_task(server.broadcast()))
+    tasks.append(asyncio.create_task(server.kill(random.Random(0))))
+    await asyncio.sleep(DURATION)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    listener.close()
+    sent = server.sent
+    delivered = {seq for seq in received if seq < sent}
+    return sent, sent - len(delivered), len(received) - len(set(received))
+
+
+async def main() -> None:
+    print(f"{'connections':<12} {'sent':>8} {'lost':>8} {'duplicated':>11}")
+    for connections in (1, 2):
+        sent, lost, duplicated = await run(connections)
+        print(f"{connections:<12} {sent:>8} {lost:>8} {duplicated:>11}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
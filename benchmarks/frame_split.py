@@ -0,0 +1,99 @@
+"""Bytes copied per WebSocket frame while splitting it into packets.
+
+Compares the old `data[offset:]` slicing loop with `split_frame`.
+
+    python benchmarks/frame_split.py
+"""
+
+from __future__ import annotations
+
+import json
+import time
+
+from nonebot.adapters.bilibili_live.packet import (
+    HEADER_LENGTH,
+    OpCode,
+    Packet,
+    split_frame,
+)
+
+SIZES = (1, 10, 50, 100, 200, 500)
+ROUNDS = 200
+
+BODY = json.dumps(
+    {"cmd": "DANMU_MSG", "info": [[0, 1, 25, 16777215], "hello" * 20]}
+).encode()
+
+
+class CountingBytes(bytes):
+    """`bytes` that records how many bytes its slices copied."""
+
+    copied = 0
+
+    def __getitem__(self, key):  # type: ignore[override]
+        result = super().__getitem__(key)
+        if isinstance(key, slice):
+            CountingBytes.copied += len(result)
+            return CountingBytes(result)
+        return result
+
+
+def make_frame(count: int) -> bytes:
+    packet = Packet.new_binary(OpCode.Command, 0, BODY).to_bytes()
+    return packet * count
+
+
+def legacy_split(data: bytes) -> int:
+    """The splitting loop `_handle_ws_message` used before `split_frame`."""
+    offset = 0
+    count = 0
+    packet = Packet.from_bytes(data[offset:])
+    while True:
+        Packet.from_bytes(data[offset : offset + packet.length])
+        count += 1
+        offset += packet.length
+        if offset >= len(data):
+            break
+        packet = Packet.from_bytes(data[offset:])
+    return count
+
+
+def zero_copy_split(data: bytes) -> int:
+    count = 0
+    for packet in split_frame(data):
+        # keeping a body is the only place a copy is made
+        CountingBytes.copied += len(packet.data)
+        count += 1
+    return count
+
+
+def measure(func, frame: bytes) -> tuple[int, float]:
+    counted = CountingBytes(frame)
+    CountingBytes.copied = 0
+    func(counted)
+    copied = CountingBytes.copied
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(frame)
+    elapsed = (time.perf_counter() - start) / ROUNDS
+    return copied, elapsed
+
+
+def main() -> None:
+    print(f"packet size: {len(BODY) + HEADER_LENGTH} bytes")
+    print(
+        f"{'packets':>8} {'frame':>9} {'legacy copied':>14} {'legacy us':>10} "
+        f"{'view copied':>12} {'view us':>8}"
+    )
+    for size in SIZES:
+        frame = make_frame(size)
+        legacy_copied, legacy_time = measure(legacy_split, frame)
+        view_copied, view_time = measure(zero_copy_split, frame)
+        print(
+            f"{size:>8} {len(frame):>9} {legacy_copied:>14} "
+            f"{legacy_time * 1e6:>10.1f} {view_copied:>12} {view_time * 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
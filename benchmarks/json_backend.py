@@ -0,0 +1,42 @@
+"""Per-command JSON decode time of every installed backend.
+
+python benchmarks/json_backend.py
+"""
+
+from __future__ import annotations
+
+import timeit
+
+from nonebot.adapters.bilibili_live import codec
+
+from payloads import PAYLOADS, encode
+
+NUMBER = 20_000
+BACKENDS = ("json", "orjson", "msgspec")
+
+
+def main() -> None:
+    available = []
+    for name in BACKENDS:
+        try:
+            codec.use_backend(name)  # pyright: ignore[reportArgumentType]
+        except ImportError:
+            continue
+        available.append(name)
+
+    print(
+        f"{'cmd (us/decode)':<30} {'bytes':>6} "
+        + " ".join(f"{b:>8}" for b in available)
+    )
+    for cmd, payload in PAYLOADS.items():
+        raw = encode(payload)
+        row = []
+        for name in available:
+            codec.use_backend(name)  # pyright: ignore[reportArgumentType]
+            elapsed = timeit.timeit(lambda: codec.loads(raw), number=NUMBER)
+            row.append(f"{elapsed / NUMBER * 1e6:>8.2f}")
+        print(f"{cmd:<30} {len(raw):>6} " + " ".join(row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Per-packet allocation and parse time of `Packet`.
+
+Compares the slotted `Packet` with the plain dataclass it replaced.
+
+    python benchmarks/packet_alloc.py
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import struct
+import sys
+import timeit
+import tracemalloc
+
+from nonebot.adapters.bilibili_live.packet import (
+    HEADER_LENGTH,
+    HEARTBEAT_FRAME,
+    OpCode,
+    Packet,
+    ProtocolVersion,
+)
+
+COUNT = 10_000
+NUMBER = 100_000
+
+
+@dataclass
+class LegacyPacket:
+    length: int
+    header_length: int
+    protocol_version: ProtocolVersion
+    opcode: OpCode
+    seq: int
+    data: bytes
+
+    @classmethod
+    def from_bytes(cls, payload: bytes) -> LegacyPacket:
+        (
+            length,
+            header_length,
+            protocol_version,
+            opcode,
+            seq,
+        ) = struct.unpack(">I2H2I", payload[:HEADER_LENGTH])
+        protocol_version = ProtocolVersion(protocol_version)
+        if protocol_version not in ProtocolVersion:
+            raise ValueError(f"Unsupported protocol version: {protocol_version}")
+        return cls(
+            length=length,
+            header_length=header_length,
+            protocol_version=ProtocolVersion(protocol_version),
+            opcode=OpCode(opcode),
+            seq=seq,
+            data=payload[HEADER_LENGTH:length],
+        )
+
+    def to_bytes(self) -> bytes:
+        header = struct.pack(
+            ">I2H2I",
+            self.length,
+            self.header_length,
+            self.protocol_version.value,
+            self.opcode.value,
+            self.seq,
+        )
+        return header + self.data
+
+
+def allocated_per_packet(cls, payload: bytes) -> float:
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    packets = [cls.from_bytes(payload) for _ in range(COUNT)]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del packets
+    return (after - before) / COUNT
+
+
+def main() -> None:
+    payload = Packet.new_binary(OpCode.Command, 0, b'{"cmd":"LIKE"}').to_bytes()
+    legacy = LegacyPacket.from_bytes(payload)
+    slotted = Packet.from_bytes(payload)
+    print(f"{'':<22} {'legacy':>10} {'slotted':>10}")
+    legacy_size = sys.getsizeof(legacy) + sys.getsizeof(legacy.__dict__)
+    print(f"{'instance size (B)':<22} {legacy_size:>10} {sys.getsizeof(slotted):>10}")
+    print(
+        f"{'allocated/packet (B)':<22} "
+        f"{allocated_per_packet(LegacyPacket, payload):>10.1f} "
+        f"{allocated_per_packet(Packet, payload):>10.1f}"
+    )
+    for name, legacy_stmt, slotted_stmt in (
+        (
+            "from_bytes (ns)",
+            lambda: LegacyPacket.from_bytes(payload),
+            lambda: Packet.from_bytes(payload),
+        ),
+        ("to_bytes (ns)", legacy.to_bytes, slotted.to_bytes),
+        (
+            "heartbeat (ns)",
+            lambda: LegacyPacket(
+                HEADER_LENGTH,
+                HEADER_LENGTH,
+                ProtocolVersion.Normal,
+                OpCode.Heartbeat,
+                0,
+                b"",
+            ).to_bytes(),
+            lambda: HEARTBEAT_FRAME,
+        ),
+    ):
+        legacy_time = timeit.timeit(legacy_stmt, number=NUMBER) / NUMBER
+        slotted_time = timeit.timeit(slotted_stmt, number=NUMBER) / NUMBER
+        print(f"{name:<22} {legacy_time * 1e9:>10.0f} {slotted_time * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,395 @@
+"""Command payloads in the shape the servers send them, shared by the benchmarks.
+
+Names, faces, uids and open_ids are placeholders.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+ROOM_ID = 544853
+
+_WEB_MEDAL = {
+    "medal_name": "小狗",
+    "medal_level": 21,
+    "target_id": 1000001,
+    "anchor_roomid": ROOM_ID,
+    "anchor_uname": "主播",
+    "medal_color": 1725515,
+    "medal_color_border": 1725515,
+    "medal_color_end": 5414290,
+    "medal_color_start": 1725515,
+    "guard_level": 3,
+    "is_lighted": 1,
+    "score": 50012345,
+    "guard_icon": "",
+    "honor_icon": "",
+}
+
+_OPEN_USER = {
+    "uid": 0,
+    "open_id": "39b8fedb-60a5-4e29-ac75-b16955f7e632",
+    "uname": "观众",
+    "uface": "https://i0.hdslb.com/bfs/face/member/noface.jpg",
+    "fans_medal_name": "小狗",
+    "fans_medal_level": 21,
+    "fans_medal_wearing_status": True,
+    "guard_level": 3,
+}
+
+
+def _danmu_msg() -> dict[str, Any]:
+    extra = {
+        "send_from_me": False,
+        "mode": 0,
+        "color": 16777215,
+        "dm_type": 0,
+        "font_size": 25,
+        "player_mode": 1,
+        "show_player_type": 0,
+        "content": "哈哈哈哈哈哈",
+        "user_hash": "2742616420",
+        "emoticon_unique": "",
+        "bulge_display": 0,
+        "recommend_score": 5,
+        "main_state_dm_color": "",
+        "objective_state_dm_color": "",
+        "direction": 0,
+        "pk_direction": 0,
+        "quartet_direction": 0,
+        "anniversary_crowd": 0,
+        "yeah_space_type": "",
+        "yeah_space_url": "",
+        "jump_to_url": "",
+        "space_type": "",
+        "space_url": "",
+        "animation": {},
+        "emots": None,
+        "is_audited": False,
+        "id_str": "6f1d1b1c0a1b1c1d1e1f",
+        "icon": None,
+        "show_reply": True,
+        "reply_mid": 0,
+        "reply_uname": "",
+        "reply_uname_color": "",
+        "reply_is_mystery": False,
+        "hit_combo": 0,
+    }
+    user = {
+        "uid": 2000002,
+        "base": {
+            "name": "观众",
+            "face": "https://i0.hdslb.com/bfs/face/member/noface.jpg",
+            "name_color": 0,
+            "is_mystery": False,
+            "risk_ctrl_info": None,
+            "origin_info": {"name": "观众", "face": ""},
+            "official_info": {"role": 0, "title": "", "desc": "", "type": -1},
+            "name_color_str": "",
+        },
+        "medal": {
+            "name": "小狗",
+            "level": 21,
+            "color_start": 1725515,
+            "color_end": 5414290,
+            "color_border": 1725515,
+            "color": 1725515,
+            "id": 0,
+            "typ": 0,
+            "is_light": 1,
+            "ruid": 1000001,
+            "guard_level": 3,
+            "score": 50012345,
+            "guard_icon": "",
+            "honor_icon": "",
+            "v2_medal_color_start": "#4775EFCC",
+            "v2_medal_color_end": "#4775EFCC",
+            "v2_medal_color_border": "#58A1F8FF",
+            "v2_medal_color_text": "#FFFFFFFF",
+            "v2_medal_color_level": "#000B7099",
+            "user_receive_count": 0,
+        },
+        "wealth": None,
+        "title": {"old_title_css_id": "", "title_css_id": ""},
+        "guard": None,
+        "uhead_frame": None,
+        "guard_leader": {"is_guard_leader": False},
+    }
+    return {
+        "cmd": "DANMU_MSG",
+        "dm_v2": "",
+        "info": [
+            [
+                0,
+                1,
+                25,
+                16777215,
+                1720000000000,
+                1720000000,
+                0,
+                "2742616420",
+                0,
+                0,
+                0,
+                "",
+                0,
+                "{}",
+                "{}",
+                {"extra": json.dumps(extra, ensure_ascii=False), "user": user},
+                {"activity_identity": "", "activity_source": 0, "not_show": 0},
+                0,
+            ],
+            "哈哈哈哈哈哈",
+            [2000002, "观众", 0, 0, 0, 10000, 1, ""],
+            [21, "小狗", "主播", ROOM_ID, 1725515, "", 0, 1725515, 1725515],
+            [0, 0, 9868950, ">50000", 0],
+            ["", ""],
+            0,
+            3,
+            None,
+            {"ts": 1720000000, "ct": "A1B2C3D4"},
+            0,
+            0,
+            None,
+            None,
+            0,
+            105,
+            [12],
+            None,
+        ],
+    }
+
+
+PAYLOADS: dict[str, dict[str, Any]] = {
+    "DANMU_MSG": _danmu_msg(),
+    "SEND_GIFT": {
+        "cmd": "SEND_GIFT",
+        "data": {
+            "action": "投喂",
+            "batch_combo_id": "batch:gift:combo_id:2000002:1000001:31036:1720000000.1",
+            "batch_combo_send": None,
+            "beatId": "0",
+            "biz_source": "Live",
+            "blind_gift": None,
+            "broadcast_id": 0,
+            "coin_type": "gold",
+            "combo_resources_id": 1,
+            "combo_send": None,
+            "combo_stay_time": 5,
+            "combo_total_coin": 100,
+            "crit_prob": 0,
+            "demarcation": 1,
+            "discount_price": 100,
+            "dmscore": 56,
+            "draw": 0,
+            "effect": 0,
+            "effect_block": 1,
+            "face": "https://i0.hdslb.com/bfs/face/member/noface.jpg",
+            "giftId": 31036,
+            "giftName": "小花花",
+            "giftType": 0,
+            "gold": 0,
+            "guard_level": 3,
+            "is_first": True,
+            "is_special_batch": 0,
+            "magnification": 1,
+            "medal_info": _WEB_MEDAL,
+            "name_color": "",
+            "num": 1,
+            "original_gift_name": "",
+            "price": 100,
+            "rcost": 200000,
+            "receive_user_info": {"uid": 1000001, "uname": "主播"},
+            "remain": 0,
+            "rnd": "1720000000121000001",
+            "send_master": None,
+            "silver": 0,
+            "super": 0,
+            "super_batch_gift_num": 1,
+            "super_gift_num": 1,
+            "svga_block": 0,
+            "switch": True,
+            "tag_image": "",
+            "tid": "1720000000121000001",
+            "timestamp": 1720000000,
+            "top_list": None,
+            "total_coin": 100,
+            "uid": 2000002,
+            "uname": "观众",
+        },
+    },
+    "INTERACT_WORD": {
+        "cmd": "INTERACT_WORD",
+        "data": {
+            "contribution": {"grade": 0},
+            "core_user_type": 0,
+            "dmscore": 12,
+            "fans_medal": _WEB_MEDAL,
+            "identities": [3, 1],
+            "is_spread": 0,
+            "msg_type": 1,
+            "privilege_type": 3,
+            "roomid": ROOM_ID,
+            "score": 1720000000000,
+            "spread_desc": "",
+            "spread_info": "",
+            "tail_icon": 0,
+            "timestamp": 1720000000,
+            "trigger_time": 1720000000000000000,
+            "uid": 2000002,
+            "uname": "观众",
+            "uname_color": "",
+        },
+    },
+    "LIKE_INFO_V3_CLICK": {
+        "cmd": "LIKE_INFO_V3_CLICK",
+        "data": {
+            "show_area": 0,
+            "msg_type": 6,
+            "like_icon": "https://i0.hdslb.com/bfs/live/23678e3d90402bea6a65251b3e728044c21b1f0f.png",
+            "uid": 2000002,
+            "like_text": "为主播点赞了",
+            "uname": "观众",
+            "uname_color": "",
+            "identities": [1],
+            "fans_medal": _WEB_MEDAL,
+            "contribution_info": {"grade": 0},
+            "dmscore": 20,
+        },
+    },
+    "WATCHED_CHANGE": {
+        "cmd": "WATCHED_CHANGE",
+        "data": {"num": 12345, "text_small": "1.2万", "text_large": "1.2万人看过"},
+    },
+    "ONLINE_RANK_COUNT": {
+        "cmd": "ONLINE_RANK_COUNT",
+        "data": {"count": 1024, "count_text": "1024", "online_count": 2048},
+    },
+    "SUPER_CHAT_MESSAGE": {
+        "cmd": "SUPER_CHAT_MESSAGE",
+        "roomid": ROOM_ID,
+        "rmb": 30,
+        "data": {
+            "background_bottom_color": "#2A60B2",
+            "background_color": "#EDF5FF",
+            "background_color_end": "#405D85",
+            "background_color_start": "#3171D2",
+            "background_icon": "",
+            "background_image": "",
+            "background_price_color": "#7497CD",
+            "color_point": 0.7,
+            "dmscore": 120,
+            "end_time": 1720000060000,
+            "gift": {"gift_id": 12000, "gift_name": "醒目留言", "num": 1},
+            "id": 9000001,
+            "is_ranked": 1,
+            "is_send_audit": 0,
+            "medal_info": _WEB_MEDAL,
+            "message": "主播晚上好",
+            "message_font_color": "#A3F6FF",
+            "message_id": 9000001,
+            "message_trans": "",
+            "price": 30,
+            "rate": 1000,
+            "start_time": 1720000000000,
+            "time": 60,
+            "token": "A1B2C3D4",
+            "trans_mark": 0,
+            "ts": 1720000000,
+            "uid": 2000002,
+            "user_info": {
+                "face": "https://i0.hdslb.com/bfs/face/member/noface.jpg",
+                "face_frame": "",
+                "guard_level": 3,
+                "is_main_vip": 0,
+                "is_svip": 0,
+                "is_vip": 0,
+                "level_color": "#61c05a",
+                "manager": 0,
+                "name_color": 0,
+                "title": "",
+                "uname": "观众",
+                "user_level": 20,
+            },
+        },
+    },
+    "DM_INTERACTION": {
+        "cmd": "DM_INTERACTION",
+        "data": {
+            "id": 8000001,
+            "status": 4,
+            "type": 102,
+            "data": json.dumps(
+                {
+                    "combo": [
+                        {
+                            "id": 1,
+                            "status": 4,
+                            "content": "哈哈哈",
+                            "cnt": 12,
+                            "guide": "他们都在说:",
+                            "left_duration": 10000,
+                            "fade_duration": 10000,
+                        }
+                    ],
+                    "merge_interval": 10,
+                    "card_appear_interval": 10,
+                    "send_interval": 1,
+                },
+                ensure_ascii=False,
+            ),
+            "dmscore": 36,
+        },
+    },
+    "LIVE_OPEN_PLATFORM_DM": {
+        "cmd": "LIVE_OPEN_PLATFORM_DM",
+        "data": {
+            **_OPEN_USER,
+            "room_id": ROOM_ID,
+            "msg": "哈哈哈哈哈哈",
+            "msg_id": "8a1b7e36-7d9c-4bb5-b5b6-3f7d6d7a2c41",
+            "timestamp": 1720000000,
+            "emoji_img_url": "",
+            "dm_type": 0,
+            "glory_level": 10,
+            "reply_open_id": "",
+            "reply_uname": "",
+            "is_admin": 0,
+        },
+    },
+    "LIVE_OPEN_PLATFORM_SEND_GIFT": {
+        "cmd": "LIVE_OPEN_PLATFORM_SEND_GIFT",
+        "data": {
+            **_OPEN_USER,
+            "room_id": ROOM_ID,
+            "gift_id": 31036,
+            "gift_name": "小花花",
+            "gift_num": 1,
+            "price": 100,
+            "r_price": 100,
+            "paid": True,
+            "timestamp": 1720000000,
+            "msg_id": "0e0f6b2e-8d7c-4b35-9c7a-3d8f2c1b0a99",
+            "gift_icon": "",
+            "combo_gift": True,
+            "combo_info": {
+                "combo_base_num": 1,
+                "combo_count": 3,
+                "combo_id": "f1e2d3c4-b5a6-4978-8a6b-5c4d3e2f1a0b",
+                "combo_timeout": 3,
+            },
+            "anchor_info": {
+                "uid": 0,
+                "open_id": "6a1c3d5e-7f90-4b2c-8d4e-6f8a0b2c4d6e",
+                "uname": "主播",
+                "uface": "",
+            },
+        },
+    },
+}
+"""Command payloads keyed by `cmd`."""
+
+
+def encode(payload: dict[str, Any]) -> bytes:
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
@@ -0,0 +1,69 @@
+"""Signing throughput of `wbi_encode`.
+
+Compares the memoized mixin key and `str.translate` with the previous
+implementation that rebuilt the mixin key with `reduce` on every call.
+
+    python benchmarks/wbi_sign.py
+"""
+
+from __future__ import annotations
+
+from functools import reduce
+import hashlib
+import time
+import timeit
+from typing import Any
+import urllib.parse
+
+from nonebot.adapters.bilibili_live.wbi import (
+    MIXIN_KEY_ENC_TAB,
+    get_mixin_key,
+    wbi_encode,
+)
+
+NUMBER = 100_000
+IMG_KEY = "7cd084941338484aae1ad9425b84077c"
+SUB_KEY = "4932caff0ff746eab6f01bf08b70ac45"
+PARAMS = {"id": 21452505, "type": 0}
+
+
+def legacy_mixin_key(img_key: str, sub_key: str) -> str:
+    mix = img_key + sub_key
+    return reduce(lambda s, i: s + mix[i], MIXIN_KEY_ENC_TAB, "")[:32]
+
+
+def legacy_wbi_encode(
+    params: dict[str, Any], img_key: str, sub_key: str
+) -> dict[str, Any]:
+    mixin_key = legacy_mixin_key(img_key, sub_key)
+    params["wts"] = round(time.time())
+    params = dict(sorted(params.items()))
+    params = {
+        k: "".join(filter(lambda chr: chr not in "!'()*", str(v)))
+        for k, v in params.items()
+    }
+    query = urllib.parse.urlencode(params)
+    params["w_rid"] = hashlib.md5((query + mixin_key).encode()).hexdigest()
+    return params
+
+
+def main() -> None:
+    assert get_mixin_key(IMG_KEY, SUB_KEY) == legacy_mixin_key(IMG_KEY, SUB_KEY)
+    print(f"{'':<12} {'mixin key':>14} {'wbi_encode':>14}")
+    for name, mixin, encode in (
+        ("legacy", legacy_mixin_key, legacy_wbi_encode),
+        ("current", get_mixin_key, wbi_encode),
+    ):
+        mixin_time = timeit.timeit(lambda: mixin(IMG_KEY, SUB_KEY), number=NUMBER)
+        encode_time = timeit.timeit(
+            lambda: encode(dict(PARAMS), IMG_KEY, SUB_KEY),
+            number=NUMBER,
+        )
+        print(
+            f"{name:<12} {NUMBER / mixin_time:>10,.0f} op/s "
+            f"{NUMBER / encode_time:>10,.0f} op/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
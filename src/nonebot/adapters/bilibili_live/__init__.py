@@ -10,6 +10,7 @@ from .event import (
     ChangeRoomInfoEvent as ChangeRoomInfoEvent,
     DanmakuEvent as DanmakuEvent,
     Event as Event,
+    GiftComboCompletedEvent as GiftComboCompletedEvent,
     GiftStarProcessEvent as GiftStarProcessEvent,
     GuardBuyEvent as GuardBuyEvent,
     GuardBuyToastEvent as GuardBuyToastEvent,
@@ -22,6 +23,7 @@ from .event import (
     InteractionLike as InteractionLike,
     InteractionShare as InteractionShare,
     InteractionVote as InteractionVote,
+    LikeBatchEvent as LikeBatchEvent,
     LikeEvent as LikeEvent,
     LikeInfoUpdateEvent as LikeInfoUpdateEvent,
     MessageEvent as MessageEvent,
@@ -47,9 +49,11 @@ from .event import (
     SpecialGiftEvent as SpecialGiftEvent,
     StopLiveRoomListEvent as StopLiveRoomListEvent,
     SuperChatEvent as SuperChatEvent,
+    UserEnterBatchEvent as UserEnterBatchEvent,
     UserEnterEvent as UserEnterEvent,
     UserFollowEvent as UserFollowEvent,
     UserShareEvent as UserShareEvent,
+    WatchedChangeBatchEvent as WatchedChangeBatchEvent,
     WatchedChangeEvent as WatchedChangeEvent,
     WebLiveStartEvent as WebLiveStartEvent,
     WebOnlyEvent as WebOnlyEvent,
@@ -1,31 +1,59 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from typing import Any
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+import copy
+import datetime
+import hashlib
+import time
+from typing import Any, Callable
 from typing_extensions import override
 
 from nonebot import get_plugin_config
 from nonebot.adapters import Adapter as BaseAdapter
 
+from . import codec
 from .bot import Bot, OpenBot, WebBot
+from .coalesce import Coalescer, ComboTracker
 from .config import Config, OpenBotConf, WebBotConf
 from .const import (
     AUTH_URL,
     BUVID3_URL,
+    DEFAULT_HOST,
     GAME_HEARTBEAT_INTERVAL,
+    GAME_TIMEOUT,
     HEARTBEAT_INTERVAL,
     NAV_API,
-    RECONNECT_INTERVAL,
+    WBI_RETRY_INTERVAL,
 )
-from .event import packet_to_event
+from .dedupe import Deduplicator
+from .dispatch import Dispatcher
+from .elision import EventElider
+from .event import Event, is_known_command, packet_to_event, warmup_validators
 from .exception import ApiNotAvailable, InteractionEndException
+from .filters import EventFilter, EventFilterUnion
+from .hosts import HEALTHY_SESSION, HostSelector, host_key
 from .log import log
+from .mirror import MirrorLink, RoomMirror
 from .models.open import Game
-from .packet import OpCode, Packet, ProtocolVersion, new_auth_packet
+from .models.room import Room
+from .packet import (
+    HEARTBEAT_FRAME,
+    OpCode,
+    Packet,
+    ProtocolVersion,
+    new_auth_packet,
+    split_frame,
+)
+from .shedding import LoadShedder
+from .state import StateStore
+from .stats import ConnectionStatus, DecodeStats, StartupStats
+from .supervisor import Supervisor
 from .utils import UA, cookie_str_to_dict, make_header, split_list
 from .wbi import get_key
 
+from nonebot.compat import model_dump, type_validate_python
 from nonebot.drivers import (
     URL,
     Driver,
@@ -45,6 +73,51 @@ class _Base(BaseAdapter):
         self.bots: dict[str, Bot] = {}
         self.tasks = set()
         self.ws = set()
+        self.decode_stats = DecodeStats()
+        self.dispatcher = Dispatcher(
+            workers=self.adapter_config.bilibili_live_dispatch_workers,
+            queue_size=self.adapter_config.bilibili_live_room_queue_size,
+            overflow=self.adapter_config.bilibili_live_queue_overflow,
+            ordered=self.adapter_config.bilibili_live_ordered_dispatch,
+            priorities=self.adapter_config.bilibili_live_event_priorities,
+        )
+        self.deduper = Deduplicator(
+            capacity=self.adapter_config.bilibili_live_dedupe_capacity,
+            enabled=self.adapter_config.bilibili_live_dedupe,
+        )
+        self.coalescer = Coalescer(
+            window=self.adapter_config.bilibili_live_coalesce_window,
+            events=set(self.adapter_config.bilibili_live_coalesce_events),
+            sink=self._deliver_derived,
+        )
+        self.combos = ComboTracker(
+            timeout=self.adapter_config.bilibili_live_gift_combo_timeout,
+            sink=self._deliver_derived,
+            enabled=self.adapter_config.bilibili_live_merge_gift_combos,
+        )
+        self.elider = EventElider(
+            enabled=self.adapter_config.bilibili_live_elide_unused_events,
+            derived={**self.coalescer.derived(), **self.combos.derived()},
+        )
+        self.shedder = LoadShedder(
+            commands=self.adapter_config.bilibili_live_lite_commands,
+            sample_lag=self.adapter_config.bilibili_live_lite_sample_lag,
+            drop_lag=self.adapter_config.bilibili_live_lite_drop_lag,
+            sample_every=self.adapter_config.bilibili_live_lite_sample_every,
+            enabled=self.adapter_config.bilibili_live_lite_mode,
+        )
+        self.supervisor = Supervisor(
+            base_delay=self.adapter_config.bilibili_live_reconnect_delay,
+            max_delay=self.adapter_config.bilibili_live_reconnect_max_delay,
+            max_connects=self.adapter_config.bilibili_live_max_concurrent_connects,
+            max_auths=self.adapter_config.bilibili_live_max_concurrent_auths,
+            rate=self.adapter_config.bilibili_live_connect_rate,
+            burst=self.adapter_config.bilibili_live_connect_burst,
+        )
+        self.startup_stats = StartupStats()
+        self.state = StateStore(self.adapter_config.bilibili_live_state_file)
+        backend = codec.use_backend(self.adapter_config.bilibili_live_json_backend)
+        log("DEBUG", f"Using JSON backend <y>{backend}</y>")
 
     @classmethod
     @override
@@ -57,18 +130,30 @@ class _Base(BaseAdapter):
         room_id: int,
         ws_conn: WebSocket,
         auth_packet: Packet,
-    ):
+        link: MirrorLink | None = None,
+        status: ConnectionStatus | None = None,
+    ) -> float | None:
+        """Run one connection until it closes, return the auth handshake RTT."""
         heartbeat_task: asyncio.Task[None] | None = None
+        connected = False
+        rtt: float | None = None
         try:
+            start = time.monotonic()
             await ws_conn.send_bytes(auth_packet.to_bytes())
             _ = Packet.from_bytes(await ws_conn.receive_bytes())
+            rtt = time.monotonic() - start
             self.ws.add(ws_conn)
+            if status is not None:
+                self.supervisor.connected(status)
             log(
                 "SUCCESS",
                 f"[{bot.self_id}] Connected to room {room_id} successfully.",
             )
+            if link is not None:
+                link.mirror.stats.connected += 1
+                connected = True
             heartbeat_task = asyncio.create_task(self._heartbeat(ws_conn))
-            await self._ws_loop(bot, ws_conn, room_id)
+            await self._ws_loop(bot, ws_conn, room_id, link)
         except InteractionEndException as e:
             log(
                 "WARNING",
@@ -98,90 +183,305 @@ class _Base(BaseAdapter):
                 e,
             )
         finally:
+            if link is not None and connected:
+                # packets this link saw first may still arrive on the other
+                # link, their entries are left to expire with the window
+                stats = link.mirror.stats
+                stats.connected -= 1
+                if stats.connected:
+                    stats.failovers += 1
+                    log(
+                        "INFO",
+                        f"[{bot.self_id}] Room {room_id} continues on "
+                        "the standby connection",
+                    )
             if ws_conn in self.ws:
                 self.ws.remove(ws_conn)
             if heartbeat_task:
                 heartbeat_task.cancel()
                 heartbeat_task = None
-        await asyncio.sleep(RECONNECT_INTERVAL)
+        return rtt
 
-    async def _ws_loop(self, bot: Bot, ws: WebSocket, room_id: int):
+    async def _ws_loop(
+        self,
+        bot: Bot,
+        ws: WebSocket,
+        room_id: int,
+        link: MirrorLink | None = None,
+    ):
         while True:
             data = await ws.receive_bytes()
-            await self._handle_ws_message(bot, data, room_id)
+            await self._handle_ws_message(bot, data, room_id, link)
 
-    async def _handle_ws_message(self, bot: Bot, data: bytes, room_id: int):
+    async def _run_connection(
+        self,
+        bot: Bot,
+        room_id: int,
+        request: Request,
+        auth_packet: Packet,
+        status: ConnectionStatus,
+        link: MirrorLink | None = None,
+    ) -> tuple[float | None, float, Exception | None]:
+        """Open and run one connection, return its RTT, start time and error."""
+        started = time.monotonic()
+        try:
+            async with AsyncExitStack() as stack:
+                # only opening the connection counts towards the concurrency cap
+                async with self.supervisor.connecting(status):
+                    ws_conn = await stack.enter_async_context(self.websocket(request))
+                rtt = await self._ws(bot, room_id, ws_conn, auth_packet, link, status)
+        except Exception as e:
+            return None, started, e
+        return rtt, started, None
+
+    def _session_failed(
+        self,
+        status: ConnectionStatus,
+        rtt: float | None,
+        started: float,
+        error: Exception | None,
+    ) -> bool:
+        """Record how a connection ended, return whether it counts as a failure."""
+        lasted = time.monotonic() - started
+        if rtt is not None and lasted >= HEALTHY_SESSION:
+            self.supervisor.recovered(status)
+            return False
+        if error is None:
+            error_str = (
+                "auth handshake failed"
+                if rtt is None
+                else f"closed after {lasted:.1f}s"
+            )
+        else:
+            error_str = repr(error)
+        self.supervisor.failed(status, error_str)
+        return True
+
+    def _setup_event_filters(self, bot: Bot, botconf: WebBotConf | OpenBotConf) -> None:
+        derived = self.elider.derived
+        bot.event_filter = EventFilter(botconf.include, botconf.exclude, derived)
+        for room_id, conf in botconf.room_filters.items():
+            bot.room_event_filters[room_id] = EventFilter(
+                conf.include, conf.exclude, derived
+            )
+        for event_filter in (bot.event_filter, *bot.room_event_filters.values()):
+            if unknown := event_filter.unknown_names():
+                log(
+                    "WARNING",
+                    f"[{bot.self_id}] Unknown commands or events in filter: "
+                    f"{', '.join(sorted(unknown))}",
+                )
+
+    def _room_bots(self, bot: Bot, room_id: int) -> Sequence[Bot]:
+        """Bots receiving the events decoded from `bot`'s connection to a room."""
+        return (bot,)
+
+    async def _handle_ws_message(
+        self,
+        bot: Bot,
+        data: bytes,
+        room_id: int,
+        link: MirrorLink | None = None,
+    ):
+        self.decode_stats.frames += 1
+        self.elider.check()
+        bots = self._room_bots(bot, room_id)
+        if len(bots) == 1:
+            event_filter = bot.get_event_filter(room_id)
+        else:
+            event_filter = EventFilterUnion.of(
+                b.get_event_filter(room_id) for b in bots
+            )
         offset = 0
         try:
-            packet = Packet.from_bytes(data[offset:])
+            for packet in split_frame(data):
+                await self._handle_business_message(
+                    bots, packet, room_id, event_filter, link
+                )
+                offset += packet.length
+        except InteractionEndException:
+            raise
         except Exception:
             log(
                 "ERROR",
-                f"room={room_id} parsing header failed, "
+                f"room={room_id} parsing packet failed, "
                 f"offset={offset}, data length={len(data)}",
             )
-            return
-
-        if packet.opcode in (OpCode.Command, OpCode.AuthReply):
-            while True:
-                try:
-                    current_packet = Packet.from_bytes(
-                        data[offset : offset + packet.length]
-                    )
-                    await self._handle_business_message(bot, current_packet, room_id)
-
-                    offset += packet.length
-                    if offset >= len(data):
-                        break
 
-                    packet = Packet.from_bytes(data[offset:])
-                except Exception:
-                    log(
-                        "ERROR",
-                        f"room={room_id} parsing packet failed, "
-                        f"offset={offset}, data length={len(data)}",
-                    )
-                    break
+    def _should_decode(
+        self,
+        packet: Packet,
+        cmd: str | None,
+        event_filter: EventFilter | None = None,
+    ) -> bool:
+        """Decide from the raw packet and its peeked `cmd` whether to parse it."""
+        if packet.opcode == OpCode.HeartbeatReply:
+            return True
+        stats = self.decode_stats
+        if packet.opcode != OpCode.Command:
+            stats.skipped_unknown += 1
+            stats.skipped_bytes += packet.length
+            return False
+        if cmd is None:
+            return True
+        if cmd in self.adapter_config.bilibili_live_ignored_commands:
+            stats.skipped_filtered += 1
+        elif not is_known_command(cmd):
+            stats.skipped_unknown += 1
+        elif self.elider.accepts_command(cmd) is False:
+            stats.skipped_elided += 1
+        elif event_filter is not None and event_filter.accepts_command(cmd) is False:
+            stats.skipped_filtered += 1
+        elif self.shedder.should_drop(cmd):
+            stats.skipped_shed += 1
         else:
-            # 单个包，直接处理
-            await self._handle_business_message(bot, packet, room_id)
-
-    async def _handle_business_message(self, bot: Bot, packet: Packet, room_id: int):
+            return True
+        stats.skipped_bytes += packet.length
+        return False
+
+    def _make_accept(
+        self, event_filter: EventFilter | None
+    ) -> Callable[[str, type[Event]], bool]:
+        """Build the per-model check applied after routing, before validation."""
+        elider = self.elider
+        stats = self.decode_stats
+
+        def accept(cmd: str, model: type[Event]) -> bool:
+            if not elider.accepts(model):
+                stats.skipped_elided += 1
+                return False
+            if event_filter is not None and not event_filter.wants(cmd, model):
+                stats.skipped_filtered += 1
+                return False
+            return True
+
+        return accept
+
+    async def _handle_business_message(
+        self,
+        bots: Sequence[Bot],
+        packet: Packet,
+        room_id: int,
+        event_filter: EventFilter | None = None,
+        link: MirrorLink | None = None,
+    ):
+        accept = self._make_accept(event_filter)
         try:
-            decoded_data = packet.decode_data()
-            if isinstance(decoded_data, list):
-                for sub_packet in decoded_data:
-                    event = packet_to_event(sub_packet, room_id)
-                    task = asyncio.create_task(bot._handle_event(event))
-                    self.tasks.add(task)
-                    task.add_done_callback(self.tasks.discard)
-            else:
-                event = packet_to_event(packet, room_id)
-                task = asyncio.create_task(bot._handle_event(event))
-                self.tasks.add(task)
-                task.add_done_callback(self.tasks.discard)
+            packets = packet.iter_packets() if packet.is_compressed else (packet,)
+            for sub_packet in packets:
+                self.decode_stats.packets += 1
+                if link is not None and not link.accept(sub_packet):
+                    continue
+                cmd = (
+                    sub_packet.peek_cmd()
+                    if sub_packet.opcode == OpCode.Command
+                    else None
+                )
+                if not self._should_decode(sub_packet, cmd, event_filter):
+                    continue
+                try:
+                    event = packet_to_event(sub_packet, room_id, accept)
+                except InteractionEndException:
+                    raise
+                except RuntimeError as e:
+                    log("TRACE", f"{e}")
+                    continue
+                except Exception as e:
+                    log("ERROR", f"Error converting packet for room {room_id}", e)
+                    continue
+                if event is None:
+                    continue
+                self.decode_stats.decoded += 1
+                if len(bots) == 1:
+                    await self._deliver(bots[0], event, room_id, cmd)
+                    continue
+                model = type(event)
+                for index, bot in enumerate(bots):
+                    bot_filter = bot.get_event_filter(room_id)
+                    # without a peeked cmd, match the filter on the event class
+                    if bot_filter is not None and not bot_filter.wants(
+                        cmd or model.__name__, model
+                    ):
+                        continue
+                    # _check_to_me sets to_me per bot, so each bot needs its own copy
+                    await self._deliver(
+                        bot, copy.copy(event) if index else event, room_id, cmd
+                    )
         except InteractionEndException:
             raise
-        except RuntimeError as e:
-            log("TRACE", f"{e}")
         except Exception as e:
             log("ERROR", f"Error processing business message for room {room_id}", e)
 
+    async def _deliver(
+        self, bot: Bot, event: Event, room_id: int, cmd: str | None = None
+    ) -> None:
+        if self.deduper.is_duplicate(bot.self_id, room_id, event):
+            return
+        first_events = self.startup_stats.first_events
+        if room_id not in first_events and self.startup_stats.started is not None:
+            first_events[room_id] = elapsed = (
+                time.monotonic() - self.startup_stats.started
+            )
+            log("DEBUG", f"First event from room {room_id} after {elapsed:.2f}s")
+        model = type(event)
+        event_filter = bot.get_event_filter(room_id)
+        if event_filter is None or event_filter.accepts_derived(model):
+            self.combos.offer(bot, event, room_id)
+            if self.coalescer.offer(bot, event, room_id):
+                return
+        if (
+            event_filter is not None
+            and model in event_filter.derived
+            and not event_filter.accepts(cmd or model.__name__, model)
+        ):
+            # decoded only for the events the adapter derives from it
+            return
+        await self.dispatcher.put(bot, event, room_id)
+
+    async def _deliver_derived(self, bot: Bot, event: Event, room_id: int) -> None:
+        """Dispatch an event merged by the adapter, applying the bot's filter."""
+        event_filter = bot.get_event_filter(room_id)
+        model = type(event)
+        if event_filter is not None and not event_filter.accepts(model.__name__, model):
+            return
+        await self.dispatcher.put(bot, event, room_id)
+
     async def _heartbeat(
         self,
         ws: WebSocket,
     ):
         while True:
             try:
-                await ws.send_bytes(
-                    Packet.new_binary(OpCode.Heartbeat, 0, b"").to_bytes()
-                )
+                await ws.send_bytes(HEARTBEAT_FRAME)
             except Exception as e:
                 log("WARNING", "Error while sending heartbeat, Ignored!", e)
             await asyncio.sleep(HEARTBEAT_INTERVAL)
 
 
+def _session_key(cookie: dict[str, str]) -> str:
+    """Identify a login session in the state file without storing the cookie."""
+    return hashlib.sha256(cookie.get("SESSDATA", "").encode()).hexdigest()[:16]
+
+
 class _WebApiAdapterMixin(_Base):
+    @override
+    def __init__(self, driver: Driver, **kwargs: Any):
+        super().__init__(driver, **kwargs)
+        self.room_bots: dict[int, list[WebBot]] = {}
+        """每个直播间的 WebBot，第一个 Bot 持有连接，其余共享其事件"""
+        self.mirrors: dict[int, RoomMirror] = {}
+        """开启冗余连接的直播间"""
+        self.room_owners: dict[int, asyncio.Task[None]] = {}
+        """直播间到持有其连接的任务，任务结束后由下一个 Bot 接管"""
+        self.hosts = HostSelector(probe=self.adapter_config.bilibili_live_probe_hosts)
+
+    @override
+    def _room_bots(self, bot: Bot, room_id: int) -> Sequence[Bot]:
+        bots = self.room_bots.get(room_id)
+        if bots and bots[0] is bot:
+            return bots
+        return super()._room_bots(bot, room_id)
+
     async def _get_wbi_keys(self, cookie: dict[str, str]) -> tuple[str, str, int]:
         req = Request(
             "GET",
@@ -192,20 +492,35 @@ class _WebApiAdapterMixin(_Base):
         resp = await self.request(req)
         if not resp.content:
             raise RuntimeError(f"Failed to login: {resp.status_code}")
-        data = json.loads(resp.content)
+        data = codec.loads(resp.content)
         if resp.status_code != 200:
             raise RuntimeError(
                 f"Failed to login: {resp.status_code}, "
                 f"{data.get('message', 'Unknown error')}"
             )
-        img_key = data["data"]["wbi_img"]["img_url"]
-        sub_key = data["data"]["wbi_img"]["sub_url"]
-        return get_key(img_key), get_key(sub_key), data["data"]["mid"]
-
-    async def _login_web(self, botconf: WebBotConf):
-        img_key, sub_key, mid = await self._get_wbi_keys(
-            cookie_str_to_dict(botconf.cookie)
+        img_key = get_key(data["data"]["wbi_img"]["img_url"])
+        sub_key = get_key(data["data"]["wbi_img"]["sub_url"])
+        mid = data["data"]["mid"]
+        self.state.put(
+            "wbi",
+            _session_key(cookie),
+            {
+                "img_key": img_key,
+                "sub_key": sub_key,
+                "mid": mid,
+                "date": datetime.date.today().isoformat(),
+            },
         )
+        return img_key, sub_key, mid
+
+    async def _login_web(self, botconf: WebBotConf) -> WebBot:
+        cookie = cookie_str_to_dict(botconf.cookie)
+        saved = self.state.get("wbi", _session_key(cookie))
+        if saved and saved["date"] == datetime.date.today().isoformat():
+            img_key, sub_key, mid = saved["img_key"], saved["sub_key"], saved["mid"]
+        else:
+            async with self.supervisor.throttle():
+                img_key, sub_key, mid = await self._get_wbi_keys(cookie)
         bot = WebBot(
             self,
             self_id=str(mid),
@@ -213,10 +528,33 @@ class _WebApiAdapterMixin(_Base):
             sub_key=sub_key,
             cookie=cookie_str_to_dict(botconf.cookie),
         )
+        self._setup_event_filters(bot, botconf)
         self.bot_connect(bot)
+        task = asyncio.create_task(self._wbi_refresher(bot))
+        task.add_done_callback(self.tasks.discard)
+        self.tasks.add(task)
         for room_id in botconf.room_ids:
             task = asyncio.create_task(self._listen_room_web(bot, room_id))
             task.add_done_callback(self.tasks.discard)
+            self.tasks.add(task)
+        return bot
+
+    async def _wbi_refresher(self, bot: WebBot) -> None:
+        """Renew the WBI keys right after midnight, before any request needs them."""
+        while True:
+            now = datetime.datetime.now()
+            midnight = datetime.datetime.combine(
+                now.date() + datetime.timedelta(days=1), datetime.time()
+            )
+            await asyncio.sleep((midnight - now).total_seconds() + 1)
+            while bot.wbi_date != datetime.date.today():
+                try:
+                    async with self.supervisor.throttle():
+                        await bot.refresh_wbi_keys()
+                except Exception as e:
+                    log("WARNING", f"[{bot.self_id}] Failed to refresh WBI keys", e)
+                    await asyncio.sleep(WBI_RETRY_INTERVAL)
+            log("DEBUG", f"[{bot.self_id}] WBI keys refreshed")
 
     async def _request_buvid3(self, bot: WebBot) -> str:
         request = Request("GET", URL(BUVID3_URL), headers=make_header())
@@ -224,7 +562,7 @@ class _WebApiAdapterMixin(_Base):
         body = resp.content
         if resp.status_code != 200 or not body:
             raise RuntimeError(f"Failed to get buvid3: {resp.status_code}, {body}")
-        data = json.loads(body)
+        data = codec.loads(body)
         if data.get("code") != 0:
             raise RuntimeError(
                 f"Failed to get buvid3: {data.get('code')}, {data.get('message')}"
@@ -242,44 +580,162 @@ class _WebApiAdapterMixin(_Base):
             raise RuntimeError(
                 f"Failed to get auth info: {resp.status_code}, {resp.content}"
             )
-        data = json.loads(resp.content)
+        data = codec.loads(resp.content)
         if data.get("code") != 0:
             raise RuntimeError(
                 f"Failed to get auth info: {data.get('code')}, {data.get('message')}"
             )
         return data["data"]
 
+    async def _get_buvid3(self, bot: WebBot) -> str:
+        async def request() -> str:
+            buvid3 = self.state.get("buvid3", bot.self_id, ttl)
+            if buvid3 is None:
+                async with self.supervisor.throttle():
+                    buvid3 = await self._request_buvid3(bot)
+                self.state.put("buvid3", bot.self_id, buvid3)
+            return buvid3
+
+        ttl = self.adapter_config.bilibili_live_buvid3_ttl
+        return await bot.cache.get("buvid3", request, ttl)
+
+    async def _get_room(self, bot: WebBot, room_id: int) -> Room:
+        """Get room info by long or short id, cached per bot."""
+
+        async def request() -> Room:
+            state_key = f"{bot.self_id}:{room_id}"
+            if (saved := self.state.get("rooms", state_key, ttl)) is not None:
+                room = type_validate_python(Room, saved)
+            else:
+                async with self.supervisor.throttle():
+                    room = await bot.get_room_info(room_id)
+                self.state.put("rooms", state_key, model_dump(room))
+            # cache it under the other id as well
+            for other_id in (room.room_id, room.short_id):
+                if other_id and other_id != room_id:
+                    bot.cache.set(("room", other_id), room, ttl)
+            return room
+
+        ttl = self.adapter_config.bilibili_live_room_info_ttl
+        return await bot.cache.get(("room", room_id), request, ttl)
+
     async def _listen_room_web(self, bot: WebBot, room_id: int):
-        buvid3 = await self._request_buvid3(bot)
-        bot.cookie["buvid3"] = buvid3
-        room = await bot.get_room_info(room_id)
+        key = f"web:{bot.self_id}:{room_id}"
+        status = self.supervisor.register(key)
+        while True:
+            try:
+                self.supervisor.set_state(status, "authenticating")
+                bot.cookie["buvid3"] = await self._get_buvid3(bot)
+                room = await self._get_room(bot, room_id)
+            except Exception as e:
+                log("ERROR", f"Failed to get info of room {room_id}", e)
+                self.supervisor.failed(status, repr(e))
+                await self.supervisor.backoff(key, status)
+                continue
+            break
+        # each connection to the room registers its own status under the long id
+        self.supervisor.connections.pop(key, None)
         bot.rooms[room_id] = room
+        if (event_filter := bot.room_event_filters.get(room_id)) is not None:
+            # filters may be configured with the short room id
+            bot.room_event_filters[room.room_id] = event_filter
         room_id = room.room_id
+        bots = self.room_bots.setdefault(room_id, [])
+        if bot in bots:
+            return
+        bots.append(bot)
+        task = asyncio.current_task()
+        assert task is not None
+        try:
+            waited = False
+            while (owner := self.room_owners.get(room_id)) is not None:
+                # the owner's task removes itself when it ends, for whatever reason
+                log(
+                    "INFO",
+                    f"[{bot.self_id}] Sharing the connection to room {room_id} "
+                    f"of [{bots[0].self_id}]",
+                )
+                waited = True
+                await asyncio.wait({owner})
+            self.room_owners[room_id] = task
+            # the owner goes first, see _room_bots
+            bots.remove(bot)
+            bots.insert(0, bot)
+            if waited:
+                log("INFO", f"[{bot.self_id}] Taking over the connection to {room_id}")
+            await self._serve_room_web(bot, room)
+        finally:
+            if bot in bots:
+                bots.remove(bot)
+            if self.room_owners.get(room_id) is task:
+                del self.room_owners[room_id]
+
+    async def _serve_room_web(self, bot: WebBot, room: Room):
+        room_id = room.room_id
+        redundant = self.adapter_config.bilibili_live_redundant_rooms
+        if room_id in redundant or room.short_id in redundant:
+            mirror = self.mirrors[room_id] = RoomMirror()
+            await asyncio.gather(
+                self._connect_room_web(bot, room_id, mirror.link(0)),
+                self._connect_room_web(bot, room_id, mirror.link(1)),
+            )
+        else:
+            await self._connect_room_web(bot, room_id)
+
+    async def _connect_room_web(
+        self,
+        bot: WebBot,
+        room_id: int,
+        link: MirrorLink | None = None,
+    ):
+        key = f"web:{bot.self_id}:{room_id}"
+        if link is not None:
+            key += f"#{link.index}"
+        status = self.supervisor.register(key)
         while True:
-            auth_info = await self._auth(bot, room_id)
+            try:
+                bot.cookie["buvid3"] = await self._get_buvid3(bot)
+                async with self.supervisor.authenticating(status):
+                    auth_info = await self._auth(bot, room_id)
+            except Exception as e:
+                log("ERROR", f"Failed to get danmaku info of room {room_id}", e)
+                self.supervisor.failed(status, repr(e))
+                await self.supervisor.backoff(key, status)
+                continue
             token = auth_info["token"]
-            host = auth_info["host_list"][0]["host"]
-            port = auth_info["host_list"][0]["wss_port"]
+            hosts = auth_info.get("host_list") or [DEFAULT_HOST]
+            await self.hosts.probe(hosts)
+            hosts = self.hosts.order(hosts)
+            # keep redundant links on different hosts as the ranking changes
+            host = hosts[0] if link is None else link.choose_host(hosts)
 
             ws = Request(
                 "GET",
-                URL(f"wss://{host}:{port}/sub"),
+                URL(f"wss://{host['host']}:{host['wss_port']}/sub"),
                 headers={
                     "User-Agent": UA,
                 },
                 timeout=30,
                 cookies=bot.cookie,
             )
-            async with self.websocket(ws) as ws_conn:
-                auth_packet = new_auth_packet(
-                    room_id, int(bot.self_id), token, bot.cookie["buvid3"]
-                )
-                await self._ws(
-                    bot,
-                    room_id,
-                    ws_conn,
-                    auth_packet,
+            auth_packet = new_auth_packet(
+                room_id, int(bot.self_id), token, bot.cookie["buvid3"]
+            )
+            rtt, started, error = await self._run_connection(
+                bot, room_id, ws, auth_packet, status, link
+            )
+            if error is not None:
+                log(
+                    "ERROR",
+                    f"Failed to connect to {host_key(host)} for room {room_id}",
+                    error,
                 )
+            if rtt is not None:
+                self.hosts.record_success(host, rtt)
+            if self._session_failed(status, rtt, started, error):
+                # a host that keeps dropping us right away should not stay first
+                self.hosts.record_failure(host)
+            await self.supervisor.backoff(key, status)
 
 
 class _OpenplatformAdapterMixin(_Base):
@@ -288,7 +744,7 @@ class _OpenplatformAdapterMixin(_Base):
         super().__init__(driver, **kwargs)
         self.bots: dict[str, OpenBot] = {}
 
-    async def _login_open(self, botconf: OpenBotConf) -> None:
+    async def _login_open(self, botconf: OpenBotConf) -> OpenBot:
         bot = self.bots.get(botconf.access_key)
         if not bot:
             bot = OpenBot(
@@ -297,6 +753,7 @@ class _OpenplatformAdapterMixin(_Base):
                 access_secret=botconf.access_secret,
                 app_id=botconf.app_id,
             )
+            self._setup_event_filters(bot, botconf)
             self.bot_connect(bot)
         task = asyncio.create_task(self._game_heartbeat(bot))
         task.add_done_callback(self.tasks.discard)
@@ -305,6 +762,7 @@ class _OpenplatformAdapterMixin(_Base):
             task = asyncio.create_task(self._listen_room_open(bot, code))
             task.add_done_callback(self.tasks.discard)
             self.tasks.add(task)
+        return bot
 
     async def _game_heartbeat(self, bot: OpenBot):
         while True:
@@ -324,52 +782,73 @@ class _OpenplatformAdapterMixin(_Base):
                             ),
                         )
                         continue
-                    data = json.loads(resp.content)
-                    if data["data"]["failed_game_ids"]:
+                    data = codec.loads(resp.content)
+                    failed = data["data"]["failed_game_ids"]
+                    if failed:
                         log(
                             "WARNING",
-                            (
-                                "Failed to send heartbeat for games: "
-                                f"{data['data']['failed_game_ids']}"
-                            ),
+                            f"Failed to send heartbeat for games: {failed}",
                         )
+                    for game in bot.games.values():
+                        if (
+                            game.game_id in game_ids_chunk
+                            and game.game_id not in failed
+                        ):
+                            self.state.touch("games", f"{bot.self_id}:{game.code}")
                 except Exception as e:
                     log("WARNING", "Error while sending game heartbeat.", e)
             await asyncio.sleep(GAME_HEARTBEAT_INTERVAL)
 
+    async def _start_game(
+        self, bot: OpenBot, code: str, status: ConnectionStatus
+    ) -> dict[str, Any] | None:
+        request = bot.make_request("v2/app/start", {"code": code, "app_id": bot.app_id})
+        async with self.supervisor.authenticating(status):
+            resp = await self.request(request)
+        if resp.status_code != 200 or not resp.content:
+            log(
+                "ERROR",
+                (
+                    f"Failed to start game with identify {code}: "
+                    f"[{resp.status_code}] {resp.content}"
+                ),
+            )
+            self.supervisor.stop(status, f"HTTP {resp.status_code}")
+            return None
+        data = codec.loads(resp.content)
+        if data.get("code") != 0:
+            log(
+                "ERROR",
+                (
+                    f"Failed to start game with identify {code}"
+                    f": [{data.get('code')}] {data.get('message')}"
+                ),
+            )
+            self.supervisor.stop(status, f"[{data.get('code')}] {data.get('message')}")
+            return None
+        return data["data"]
+
     async def _listen_room_open(self, bot: OpenBot, code: str):
+        key = f"open:{bot.self_id}:{code}"
+        status = self.supervisor.register(key)
+        state_key = f"{bot.self_id}:{code}"
+        info = self.state.get("games", state_key, GAME_TIMEOUT)
+        if info is not None:
+            log("INFO", f"Resuming game {info['game_info']['game_id']} of {code}")
         while True:
-            request = bot.make_request(
-                "v2/app/start", {"code": code, "app_id": bot.app_id}
-            )
-            resp = await self.request(request)
-            if resp.status_code != 200 or not resp.content:
-                log(
-                    "ERROR",
-                    (
-                        f"Failed to start game with identify {code}: "
-                        f"[{resp.status_code}] {resp.content}"
-                    ),
-                )
-                return
-            data = json.loads(resp.content)
-            if data.get("code") != 0:
-                log(
-                    "ERROR",
-                    (
-                        f"Failed to start game with identify {code}"
-                        f": [{data.get('code')}] {data.get('message')}"
-                    ),
-                )
-                return
+            if info is None:
+                info = await self._start_game(bot, code, status)
+                if info is None:
+                    return
+                self.state.put("games", state_key, info)
             game = Game(
                 code=code,
-                game_id=data["data"]["game_info"]["game_id"],
-                **data["data"]["anchor_info"],
+                game_id=info["game_info"]["game_id"],
+                **info["anchor_info"],
             )
             bot.games[game.room_id] = game
-            url = data["data"]["websocket_info"]["wss_link"][0]
-            auth_body = data["data"]["websocket_info"]["auth_body"]
+            url = info["websocket_info"]["wss_link"][0]
+            auth_body = info["websocket_info"]["auth_body"]
             ws = Request(
                 "GET",
                 URL(url),
@@ -378,14 +857,16 @@ class _OpenplatformAdapterMixin(_Base):
             auth_packet = Packet.new_binary(
                 OpCode.Auth, 0, auth_body.encode("utf-8"), ProtocolVersion.Heartbeat
             )
-            async with self.websocket(ws) as ws_conn:
-                await self._ws(
-                    bot,
-                    game.room_id,
-                    ws_conn,
-                    auth_packet,
-                )
+            rtt, started, error = await self._run_connection(
+                bot, game.room_id, ws, auth_packet, status
+            )
+            if error is not None:
+                log("ERROR", f"Failed to connect to room {game.room_id}", error)
             bot.games.pop(game.room_id, None)
+            self.state.remove("games", state_key)
+            info = None
+            self._session_failed(status, rtt, started, error)
+            await self.supervisor.backoff(key, status)
 
 
 class Adapter(_WebApiAdapterMixin, _OpenplatformAdapterMixin):
@@ -409,22 +890,63 @@ class Adapter(_WebApiAdapterMixin, _OpenplatformAdapterMixin):
         self.driver.on_shutdown(self.shutdown)
 
     async def startup(self):
-        for botconf in self.adapter_config.bilibili_live_bots:
+        elapsed = warmup_validators()
+        self.decode_stats.validator_warmup = elapsed
+        log("DEBUG", f"Event validators warmed up in {elapsed * 1000:.1f}ms")
+        self.elider.check()
+        self.dispatcher.start()
+        self.shedder.start()
+        self.startup_stats.started = time.monotonic()
+        self.state.load()
+        await asyncio.gather(
+            *(
+                self._login(index, botconf)
+                for index, botconf in enumerate(self.adapter_config.bilibili_live_bots)
+            )
+        )
+        log(
+            "DEBUG",
+            f"Logged in {len(self.startup_stats.logins)} bots in "
+            f"{time.monotonic() - self.startup_stats.started:.2f}s",
+        )
+
+    async def _login(self, index: int, botconf: WebBotConf | OpenBotConf) -> None:
+        try:
             if isinstance(botconf, WebBotConf):
-                await self._login_web(botconf)
+                bot = await self._login_web(botconf)
             else:
-                await self._login_open(botconf)
+                bot = await self._login_open(botconf)
+        except Exception as e:
+            log("ERROR", f"Failed to login bot #{index} in BILIBILI_LIVE_BOTS", e)
+            return
+        if self.startup_stats.started is not None:
+            self.startup_stats.logins[bot.self_id] = (
+                time.monotonic() - self.startup_stats.started
+            )
 
     async def shutdown(self):
         self.ws.clear()
+        self.room_bots.clear()
+        self.mirrors.clear()
+        self.room_owners.clear()
+        self.supervisor.clear()
         for task in self.tasks:
             task.cancel()
         self.tasks.clear()
+        self.coalescer.stop()
+        self.combos.stop()
+        self.deduper.clear()
+        await self.dispatcher.stop()
+        await self.shedder.stop()
         for bot in self.bots.copy().values():
             self.bot_disconnect(bot)
+            if isinstance(bot, WebBot):
+                bot.send_queue.stop()
             if isinstance(bot, OpenBot):
-                await bot._close()
+                # keep the games running so that they can be resumed on restart
+                await bot._close(end_games=not self.state)
         self.bots.clear()
+        self.state.save()
 
     @override
     async def _call_api(self, bot: Bot, api: str, **data: Any) -> Any:
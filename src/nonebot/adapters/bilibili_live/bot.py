@@ -1,24 +1,31 @@
 from __future__ import annotations
 
+import asyncio
 import datetime
 import hashlib
 import hmac
-import json
 import time
 from typing import TYPE_CHECKING, Any, Union
 from typing_extensions import override
 import uuid
 
-from nonebot.adapters import Bot as BaseBot
+from nonebot.adapters import (
+    Adapter as BaseAdapter,
+    Bot as BaseBot,
+)
 
+from . import codec
+from .cache import TTLCache
 from .const import PLATFORM_URL
 from .event import DanmakuEvent, Event, SuperChatEvent
 from .exception import ActionFailed, ApiNotAvailable
+from .filters import EventFilter
 from .log import log
 from .message import AtSegment, Message, MessageSegment
 from .models.open import Game
 from .models.room import MasterData, Room, UserRoomStatus
 from .models.user_manage import SilentUserListData
+from .sendqueue import SendQueue
 from .utils import make_header
 from .wbi import wbi_encode
 
@@ -46,6 +53,17 @@ def _check_to_me(bot: Bot, event: Event) -> None:
 
 
 class Bot(BaseBot):
+    @override
+    def __init__(self, adapter: BaseAdapter, self_id: str):
+        super().__init__(adapter, self_id)
+        self.event_filter = EventFilter()
+        self.room_event_filters: dict[int, EventFilter] = {}
+
+    def get_event_filter(self, room_id: int) -> EventFilter | None:
+        """获取直播间生效的事件过滤器，不过滤时返回 `None`"""
+        event_filter = self.room_event_filters.get(room_id, self.event_filter)
+        return event_filter or None
+
     async def _handle_event(self, event: Event) -> None:
         _check_to_me(self, event)
         await handle_event(self, event)
@@ -67,17 +85,39 @@ class WebBot(Bot):
         self.sub_key = sub_key
         self.rooms: dict[int, Room] = {}
         self.cookie = cookie
+        self.cache = TTLCache()
+        """连接直播间时使用的 buvid3 和直播间信息缓存"""
         self.seq = 0
-        self._today = datetime.datetime.now().day
+        self.wbi_date = datetime.date.today()
+        """WBI 密钥的获取日期"""
+        config = adapter.adapter_config
+        self.send_queue = SendQueue(
+            self._send_danmaku,
+            room_rate=config.bilibili_live_send_room_rate,
+            room_burst=config.bilibili_live_send_room_burst,
+            account_rate=config.bilibili_live_send_account_rate,
+            account_burst=config.bilibili_live_send_account_burst,
+            max_length=config.bilibili_live_danmaku_max_length,
+            merge=config.bilibili_live_merge_danmaku,
+            retries=config.bilibili_live_send_retries,
+            retry_delay=config.bilibili_live_send_retry_delay,
+        )
+        """弹幕发送队列"""
+
+    async def refresh_wbi_keys(self) -> None:
+        """刷新 WBI 密钥，同时发起的刷新只请求一次"""
+        await self.cache.get("wbi_keys", self._fetch_wbi_keys, 0)
+
+    async def _fetch_wbi_keys(self) -> None:
+        today = datetime.date.today()
+        self.img_key, self.sub_key, _ = await self.adapter._get_wbi_keys(self.cookie)
+        self.wbi_date = today
 
     async def _wbi_encode(self, data: dict[str, Any] | None = None) -> dict[str, Any]:
         """Encode data with WBI keys."""
-        if datetime.datetime.now().day != self._today:
-            # Update wbi key
-            self.img_key, self.sub_key, _ = await self.adapter._get_wbi_keys(
-                self.cookie
-            )
-            self._today = datetime.datetime.now().day
+        if self.wbi_date != datetime.date.today():
+            # normally renewed by the adapter at midnight already
+            await self.refresh_wbi_keys()
         return wbi_encode(data or {}, self.img_key, self.sub_key)
 
     async def _request(self, req: Request) -> Response:
@@ -89,7 +129,7 @@ class WebBot(Bot):
         resp = await self._request(req)
         if not resp.content:
             raise ApiNotAvailable()
-        data = json.loads(resp.content)
+        data = codec.loads(resp.content)
         if data["code"] != 0:
             raise ActionFailed(
                 code=data["code"],
@@ -102,6 +142,8 @@ class WebBot(Bot):
     ) -> None:
         """发送弹幕
 
+        弹幕经发送队列限速发送，超长时拆分为多条，在全部发送后返回。
+
         Args:
             room_id: 直播间Id
             msg: 弹幕内容
@@ -111,6 +153,28 @@ class WebBot(Bot):
         Returns:
             None
         """
+        await self.queue_danmaku(room_id, msg, mode, reply_mid)
+
+    def queue_danmaku(
+        self, room_id: int, msg: str, mode: int = 1, reply_mid: int = 0
+    ) -> asyncio.Future[None]:
+        """将弹幕加入发送队列而不等待发送
+
+        Args:
+            room_id: 直播间Id
+            msg: 弹幕内容
+            mode: 弹幕发送模式
+            reply_mid: 回复的用户mid，默认为0表示不回复
+
+        Returns:
+            asyncio.Future[None]: 弹幕全部发送后完成，发送失败时为对应的异常；
+                取消后尚未发送的部分不再发送
+        """
+        return self.send_queue.put(room_id, msg, mode, reply_mid)
+
+    async def _send_danmaku(
+        self, room_id: int, msg: str, mode: int, reply_mid: int
+    ) -> None:
         csrf = self.cookie.get("bili_jct", "")
         request = Request(
             "POST",
@@ -318,7 +382,7 @@ class OpenBot(Bot):
         self.games: dict[int, Game] = {}
 
     def make_request(self, path: str, data: dict[str, Any]) -> Request:
-        content = json.dumps(data, ensure_ascii=False)
+        content = codec.dumps(data)
         x_bili_header = {
             "x-bili-accesskeyid": self.access_key,
             "x-bili-content-md5": hashlib.md5(content.encode("utf-8")).hexdigest(),
@@ -355,8 +419,8 @@ class OpenBot(Bot):
     ) -> Any:
         raise ApiNotAvailable
 
-    async def _close(self) -> None:
-        for game in self.games.values():
+    async def _close(self, end_games: bool = True) -> None:
+        for game in self.games.values() if end_games else ():
             request = self.make_request(
                 "v2/app/end",
                 {"app_id": self.app_id, "game_id": game.game_id},
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Hashable
+import time
+from typing import Any, Callable, TypeVar
+
+from .stats import CacheStats
+
+T = TypeVar("T")
+
+
+class TTLCache:
+    """带过期时间的异步缓存
+
+    同一个键同时只有一个调用方实际获取数据，其他调用方等待其结果。获取失败时不缓存，
+    等待中的调用方会收到同样的异常。
+    """
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+        self._entries: dict[Hashable, tuple[Any, float]] = {}
+        self._pending: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and entry[1] > time.monotonic()
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._entries[key] = (value, time.monotonic() + ttl)
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get(
+        self, key: Hashable, factory: Callable[[], Awaitable[T]], ttl: float
+    ) -> T:
+        """获取 `key` 的缓存，不存在或已过期时调用 `factory` 获取并缓存 `ttl` 秒"""
+        while True:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.stats.hits += 1
+                return entry[0]
+            future = self._pending.get(key)
+            if future is None:
+                break
+            self.stats.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # the caller doing the request was cancelled, try again ourselves
+
+        self.stats.misses += 1
+        future = self._pending[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # waiters re-raise it, don't log it as unretrieved
+            raise
+        else:
+            if ttl > 0:
+                self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            del self._pending[key]
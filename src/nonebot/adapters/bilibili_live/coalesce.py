@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+import time
+from typing import TYPE_CHECKING, Any, Callable, Literal, get_args
+
+from .event import (
+    Event,
+    GiftComboCompletedEvent,
+    LikeBatchEvent,
+    LikeEvent,
+    SendGiftEvent,
+    UserEnterBatchEvent,
+    UserEnterEvent,
+    WatchedChangeBatchEvent,
+    WatchedChangeEvent,
+    get_validator,
+)
+from .log import log
+
+if TYPE_CHECKING:
+    from .bot import Bot
+
+CoalescedEventName = Literal["LikeEvent", "UserEnterEvent", "WatchedChangeEvent"]
+COALESCED_EVENT_NAMES: frozenset[CoalescedEventName] = frozenset(
+    get_args(CoalescedEventName)
+)
+
+BATCH_EVENTS: dict[type[Event], type[Event]] = {
+    LikeEvent: LikeBatchEvent,
+    UserEnterEvent: UserEnterBatchEvent,
+    WatchedChangeEvent: WatchedChangeBatchEvent,
+}
+"""可合并的事件类及其对应的批量事件类"""
+
+MAX_BATCH_USER_IDS = 200
+
+Sink = Callable[["Bot", Event, int], Coroutine[Any, Any, None]]
+
+
+class _Batch:
+    __slots__ = ("bot", "count", "end_time", "last", "start_time", "total", "user_ids")
+
+    def __init__(self, bot: Bot) -> None:
+        self.bot = bot
+        self.count = 0
+        self.total = 0
+        self.user_ids: dict[str, None] = {}
+        self.start_time = self.end_time = time.time()
+        self.last: Event | None = None
+
+    def add(self, event: Event) -> None:
+        self.count += 1
+        self.end_time = time.time()
+        self.last = event
+        if isinstance(event, LikeEvent):
+            self.total += event.like_count or 1
+        if isinstance(event, (LikeEvent, UserEnterEvent)):
+            if len(self.user_ids) < MAX_BATCH_USER_IDS:
+                self.user_ids[event.get_user_id()] = None
+
+    def to_event(self, room_id: int) -> Event:
+        data: dict[str, Any] = {
+            "count": self.count,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+        }
+        last = self.last
+        if isinstance(last, LikeEvent):
+            model = LikeBatchEvent
+            data.update(like_count=self.total, user_ids=list(self.user_ids))
+        elif isinstance(last, UserEnterEvent):
+            model = UserEnterBatchEvent
+            data.update(user_ids=list(self.user_ids))
+        elif isinstance(last, WatchedChangeEvent):
+            model = WatchedChangeBatchEvent
+            data.update(
+                num=last.num, text_small=last.text_small, text_large=last.text_large
+            )
+        else:
+            raise TypeError(f"Cannot batch event {type(last)!r}")
+        return get_validator(model)({"room_id": room_id, "data": data})
+
+
+class Coalescer:
+    """将高频通知事件按直播间合并为批量事件
+
+    每个 Bot、直播间和事件类的第一个事件开启一个时长为 `window` 的窗口，
+    窗口内的同类事件不再单独分发，窗口结束时合并为一个批量事件交给 `sink`。
+    """
+
+    def __init__(self, window: float, events: set[str], sink: Sink) -> None:
+        self.window = window
+        self.models = (
+            {model for model in BATCH_EVENTS if model.__name__ in events}
+            if window > 0
+            else set()
+        )
+        self.sink = sink
+        self._batches: dict[tuple[str, int, type[Event]], _Batch] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def derived(self) -> dict[type[Event], tuple[type[Event], ...]]:
+        """被合并的事件类到批量事件类的映射"""
+        return {model: (BATCH_EVENTS[model],) for model in self.models}
+
+    def offer(self, bot: Bot, event: Event, room_id: int) -> bool:
+        """尝试合并事件，返回事件是否已被合并"""
+        model = type(event)
+        if model not in self.models:
+            return False
+        key = (bot.self_id, room_id, model)
+        batch = self._batches.get(key)
+        if batch is None:
+            batch = self._batches[key] = _Batch(bot)
+            asyncio.get_running_loop().call_later(self.window, self._flush, key)
+        batch.add(event)
+        return True
+
+    def stop(self) -> None:
+        self._batches.clear()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    def _flush(self, key: tuple[str, int, type[Event]]) -> None:
+        batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        room_id = key[1]
+        try:
+            event = batch.to_event(room_id)
+        except Exception as e:
+            log("ERROR", f"Error building batch event for room {room_id}", e)
+            return
+        task = asyncio.create_task(self.sink(batch.bot, event, room_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+class _Combo:
+    __slots__ = (
+        "bot",
+        "count",
+        "deadline",
+        "first",
+        "last",
+        "total_num",
+        "total_price",
+    )
+
+    def __init__(self, bot: Bot, event: SendGiftEvent) -> None:
+        self.bot = bot
+        self.first = self.last = event
+        self.count = 0
+        self.total_num = 0
+        self.total_price = 0.0
+        self.deadline = 0.0
+
+    def add(self, event: SendGiftEvent, timeout: float) -> None:
+        self.count += 1
+        self.total_num += event.num
+        self.total_price += event.price * event.num
+        self.last = event
+        self.deadline = time.monotonic() + timeout
+
+    def to_event(self, combo_id: str, room_id: int) -> Event:
+        first, last = self.first, self.last
+        return get_validator(GiftComboCompletedEvent)(
+            {
+                "room_id": room_id,
+                "data": {
+                    "combo_id": combo_id,
+                    "uid": first.uid,
+                    "uname": first.uname,
+                    "open_id": first.open_id,
+                    "gift_name": first.gift_name,
+                    "total_num": self.total_num,
+                    "total_price": self.total_price,
+                    "count": self.count,
+                    "start_timestamp": first.timestamp,
+                    "end_timestamp": last.timestamp,
+                },
+            },
+        )
+
+
+class ComboTracker:
+    """按连击 ID 合并连击送礼
+
+    送礼事件照常分发，同时按 `batch_combo_id`（开放平台为 `combo_info.combo_id`）
+    累计数量和价值。一次连击在 `timeout` 秒（开放平台取与 `combo_timeout` 中较大者）
+    内没有新的送礼时视为结束，合并为一个 `GiftComboCompletedEvent` 交给 `sink`。
+    """
+
+    def __init__(self, timeout: float, sink: Sink, enabled: bool = True) -> None:
+        self.timeout = timeout
+        self.enabled = enabled
+        self.sink = sink
+        self._combos: dict[tuple[str, int, str], _Combo] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def derived(self) -> dict[type[Event], tuple[type[Event], ...]]:
+        return {SendGiftEvent: (GiftComboCompletedEvent,)} if self.enabled else {}
+
+    def offer(self, bot: Bot, event: Event, room_id: int) -> None:
+        if not (self.enabled and isinstance(event, SendGiftEvent)):
+            return
+        combo_id = event.batch_combo_id or (
+            event.combo_info.combo_id if event.combo_info else None
+        )
+        if not combo_id:
+            return
+        timeout = self.timeout
+        if event.combo_info is not None:
+            timeout = max(timeout, event.combo_info.combo_timeout)
+        key = (bot.self_id, room_id, combo_id)
+        combo = self._combos.get(key)
+        if combo is None:
+            combo = self._combos[key] = _Combo(bot, event)
+            asyncio.get_running_loop().call_later(timeout, self._expire, key)
+        combo.add(event, timeout)
+
+    def stop(self) -> None:
+        self._combos.clear()
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    def _expire(self, key: tuple[str, int, str]) -> None:
+        combo = self._combos.get(key)
+        if combo is None:
+            return
+        remaining = combo.deadline - time.monotonic()
+        if remaining > 0:
+            # the combo went on, check again at its new deadline
+            asyncio.get_running_loop().call_later(remaining, self._expire, key)
+            return
+        del self._combos[key]
+        _, room_id, combo_id = key
+        try:
+            event = combo.to_event(combo_id, room_id)
+        except Exception as e:
+            log("ERROR", f"Error building gift combo event for room {room_id}", e)
+            return
+        task = asyncio.create_task(self.sink(combo.bot, event, room_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
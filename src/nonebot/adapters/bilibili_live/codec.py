@@ -0,0 +1,79 @@
+"""JSON 编解码
+
+优先使用已安装的 orjson 或 msgspec，否则回退到标准库 json。
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Literal
+
+JSONBackend = Literal["auto", "orjson", "msgspec", "json"]
+
+_loads: Callable[[Any], Any]
+_dumps: Callable[[Any], bytes]
+backend: str = "json"
+"""当前使用的 JSON 后端"""
+
+
+def _std_loads(data: str | bytes | bytearray | memoryview) -> Any:
+    if isinstance(data, memoryview):
+        data = str(data, "utf-8")
+    return json.loads(data)
+
+
+def _std_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _load_backend(
+    name: str,
+) -> tuple[Callable[[Any], Any], Callable[[Any], bytes]]:
+    if name == "orjson":
+        import orjson
+
+        return orjson.loads, orjson.dumps
+    if name == "msgspec":
+        import msgspec
+
+        return msgspec.json.decode, msgspec.json.encode
+    if name == "json":
+        return _std_loads, _std_dumps
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+
+def use_backend(name: JSONBackend = "auto") -> str:
+    """切换 JSON 后端，返回实际使用的后端名称
+
+    `auto` 会依次尝试 orjson、msgspec 和标准库 json；
+    指定的后端未安装时抛出 `ImportError`。
+    """
+    global _loads, _dumps, backend
+
+    candidates = ("orjson", "msgspec", "json") if name == "auto" else (name,)
+    for candidate in candidates:
+        try:
+            _loads, _dumps = _load_backend(candidate)
+        except ImportError:
+            if name != "auto":
+                raise
+            continue
+        backend = candidate
+        break
+    return backend
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    return _loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """编码为紧凑的 JSON 字符串，不转义非 ASCII 字符"""
+    return _dumps(obj).decode("utf-8")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    return _dumps(obj)
+
+
+use_backend()
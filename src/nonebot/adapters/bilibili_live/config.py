@@ -1,23 +1,84 @@
 from __future__ import annotations
 
-from typing import Union
+from pathlib import Path
+from typing import Optional, Union
+
+from .coalesce import COALESCED_EVENT_NAMES, CoalescedEventName
+from .codec import JSONBackend
+from .dispatch import OverflowPolicy, PriorityName
+from .shedding import DEFAULT_LITE_COMMANDS
 
 from pydantic import BaseModel, Field
 
 
-class WebBotConf(BaseModel):
+class EventFilterConf(BaseModel):
+    include: set[str] = Field(default_factory=set)
+    """只处理这些命令或事件类，为空时处理全部"""
+    exclude: set[str] = Field(default_factory=set)
+    """不处理这些命令或事件类"""
+
+
+class WebBotConf(EventFilterConf):
     cookie: str
     room_ids: list[int] = Field(default_factory=list)
+    room_filters: dict[int, EventFilterConf] = Field(default_factory=dict)
+    """按直播间覆盖的过滤设置"""
 
 
-class OpenBotConf(BaseModel):
+class OpenBotConf(EventFilterConf):
     access_key: str
     access_secret: str
     app_id: int
     identify_codes: list[str] = Field(default_factory=list)
+    room_filters: dict[int, EventFilterConf] = Field(default_factory=dict)
+    """按直播间覆盖的过滤设置"""
 
 
 class Config(BaseModel):
     bilibili_live_bots: list[Union[WebBotConf, OpenBotConf]] = Field(
         default_factory=list
     )
+    bilibili_live_ignored_commands: set[str] = Field(default_factory=set)
+    bilibili_live_json_backend: JSONBackend = "auto"
+    bilibili_live_dispatch_workers: int = Field(16, gt=0)
+    bilibili_live_room_queue_size: int = Field(1000, gt=0)
+    bilibili_live_queue_overflow: OverflowPolicy = "block"
+    bilibili_live_ordered_dispatch: bool = False
+    bilibili_live_event_priorities: dict[str, PriorityName] = Field(
+        default_factory=dict
+    )
+    bilibili_live_reconnect_delay: float = 5
+    bilibili_live_reconnect_max_delay: float = 300
+    bilibili_live_max_concurrent_connects: int = 8
+    bilibili_live_max_concurrent_auths: int = 4
+    bilibili_live_connect_rate: float = 5
+    bilibili_live_connect_burst: int = 10
+    bilibili_live_send_room_rate: float = 1
+    bilibili_live_send_room_burst: int = 2
+    bilibili_live_send_account_rate: float = 2
+    bilibili_live_send_account_burst: int = 4
+    bilibili_live_danmaku_max_length: int = 0
+    bilibili_live_merge_danmaku: bool = False
+    bilibili_live_send_retries: int = 3
+    bilibili_live_send_retry_delay: float = 2
+    bilibili_live_state_file: Optional[Path] = None
+    bilibili_live_buvid3_ttl: float = 86400
+    bilibili_live_room_info_ttl: float = 3600
+    bilibili_live_probe_hosts: bool = True
+    bilibili_live_redundant_rooms: set[int] = Field(default_factory=set)
+    bilibili_live_dedupe: bool = True
+    bilibili_live_dedupe_capacity: int = 2048
+    bilibili_live_coalesce_window: float = 0
+    bilibili_live_coalesce_events: set[CoalescedEventName] = Field(
+        default_factory=lambda: set(COALESCED_EVENT_NAMES)
+    )
+    bilibili_live_merge_gift_combos: bool = False
+    bilibili_live_gift_combo_timeout: float = 5
+    bilibili_live_elide_unused_events: bool = True
+    bilibili_live_lite_mode: bool = False
+    bilibili_live_lite_commands: set[str] = Field(
+        default_factory=lambda: set(DEFAULT_LITE_COMMANDS)
+    )
+    bilibili_live_lite_sample_lag: float = 0.1
+    bilibili_live_lite_drop_lag: float = 0.5
+    bilibili_live_lite_sample_every: int = 10
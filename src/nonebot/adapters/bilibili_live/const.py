@@ -4,8 +4,17 @@ NAV_API = "https://api.bilibili.com/x/web-interface/nav"
 AUTH_URL = "https://api.live.bilibili.com/xlive/web-room/v1/index/getDanmuInfo"
 BUVID3_URL = "https://api.bilibili.com/x/web-frontend/getbuvid"
 
+DEFAULT_HOST = {
+    "host": "broadcastlv.chat.bilibili.com",
+    "port": 2243,
+    "wss_port": 443,
+    "ws_port": 2244,
+}
+"""`getDanmuInfo` 没有返回服务器时使用的默认弹幕服务器"""
+
 PLATFORM_URL = "https://live-open.biliapi.com"
 
 HEARTBEAT_INTERVAL = 30
 GAME_HEARTBEAT_INTERVAL = 20
-RECONNECT_INTERVAL = 5
+GAME_TIMEOUT = 60
+WBI_RETRY_INTERVAL = 60
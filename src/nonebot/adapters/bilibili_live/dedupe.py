@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+from .event import Event
+from .stats import DedupeStats
+
+
+class Deduplicator:
+    """按 `msg_id` 丢弃重复的事件
+
+    每个 Bot 和直播间保留最近 `capacity` 个 `msg_id`，超出时淘汰最久未出现的。
+    重连或互动玩法重新开启后服务器重放的事件会因此被丢弃。没有 `msg_id` 的事件不受影响。
+    """
+
+    def __init__(self, capacity: int, enabled: bool = True) -> None:
+        self.capacity = capacity
+        self.enabled = enabled and capacity > 0
+        self.stats = DedupeStats()
+        self._seen: dict[tuple[str, int], OrderedDict[str, None]] = {}
+
+    def is_duplicate(self, bot_id: str, room_id: int, event: Event) -> bool:
+        if not self.enabled:
+            return False
+        msg_id = getattr(event, "msg_id", "")
+        if not msg_id:
+            return False
+        key = (bot_id, room_id)
+        seen = self._seen.get(key)
+        if seen is None:
+            seen = self._seen[key] = OrderedDict()
+        stats = self.stats
+        if msg_id in seen:
+            seen.move_to_end(msg_id)
+            stats.hits += 1
+            return True
+        stats.misses += 1
+        seen[msg_id] = None
+        if len(seen) > self.capacity:
+            seen.popitem(last=False)
+            stats.evicted += 1
+        else:
+            stats.size += 1
+        return False
+
+    def clear(self) -> None:
+        self._seen.clear()
+        self.stats.size = 0
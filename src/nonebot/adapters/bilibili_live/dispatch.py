@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from enum import IntEnum
+from itertools import count
+import time
+from typing import TYPE_CHECKING, Literal, NamedTuple
+
+from .event import Event
+from .log import log
+from .stats import LatencyRecorder, RoomDispatchStats
+
+if TYPE_CHECKING:
+    from .bot import Bot
+
+OverflowPolicy = Literal["block", "drop_oldest", "drop_low_priority"]
+PriorityName = Literal["high", "normal", "low"]
+
+DROP_WARNING_EVERY = 1000
+"""每丢弃多少个事件输出一次警告"""
+
+
+class Priority(IntEnum):
+    """事件优先级，数值越小越先处理"""
+
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+DEFAULT_PRIORITIES: dict[str, PriorityName] = {
+    "SuperChatEvent": "high",
+    "GiftComboCompletedEvent": "high",
+    "GuardBuyEvent": "high",
+    "GuardBuyToastEvent": "high",
+    "SendGiftEvent": "high",
+    "HeartbeatEvent": "low",
+    "LikeBatchEvent": "low",
+    "LikeEvent": "low",
+    "LikeInfoUpdateEvent": "low",
+    "OnlineRankCountEvent": "low",
+    "UserEnterBatchEvent": "low",
+    "UserEnterEvent": "low",
+    "WatchedChangeBatchEvent": "low",
+    "WatchedChangeEvent": "low",
+}
+"""默认的事件优先级，未列出的事件为 `normal`"""
+
+
+class _Item(NamedTuple):
+    seq: int
+    bot: Bot
+    event: Event
+    enqueued: float
+
+
+class _RoomQueue:
+    def __init__(self, room_id: int) -> None:
+        self.room_id = room_id
+        self.queues: tuple[deque[_Item], ...] = tuple(deque() for _ in Priority)
+        self.size = 0
+        self.entry: list | None = None
+        """当前在就绪队列中的有效条目，不在就绪队列中时为 `None`"""
+        self.busy = False
+        self.not_full = asyncio.Event()
+        self.stats = RoomDispatchStats()
+
+    def best_level(self) -> int | None:
+        for level, queue in enumerate(self.queues):
+            if queue:
+                return level
+        return None
+
+    def worst_level(self) -> int | None:
+        for level in reversed(range(len(self.queues))):
+            if self.queues[level]:
+                return level
+        return None
+
+    def oldest_level(self) -> int | None:
+        heads = [
+            (queue[0].seq, level) for level, queue in enumerate(self.queues) if queue
+        ]
+        return min(heads)[1] if heads else None
+
+    def pop(self, level: int) -> _Item:
+        self.size -= 1
+        self.stats.depth = self.size
+        self.not_full.set()
+        return self.queues[level].popleft()
+
+
+class Dispatcher:
+    """事件分发器
+
+    每个直播间一个有界队列，由固定数量的 worker 取出事件交给 Bot 处理。
+    worker 总是先处理优先级最高的事件，直播间之间按其最高优先级的待处理事件排序。
+    `ordered` 为真时，同一直播间的事件按到达顺序逐个处理，不同直播间之间仍然并行。
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        queue_size: int,
+        overflow: OverflowPolicy,
+        ordered: bool = False,
+        priorities: dict[str, PriorityName] | None = None,
+    ) -> None:
+        self.workers = workers
+        self.queue_size = queue_size
+        self.overflow: OverflowPolicy = overflow
+        self.ordered = ordered
+        self.priorities = {
+            name: Priority[value.upper()]
+            for name, value in {**DEFAULT_PRIORITIES, **(priorities or {})}.items()
+        }
+        self.rooms: dict[int, _RoomQueue] = {}
+        self.latency: dict[str, LatencyRecorder] = {}
+        self._priority_cache: dict[type[Event], Priority] = {}
+        self._seq = count()
+        self._ready: asyncio.PriorityQueue[list] | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def start(self) -> None:
+        if self._ready is not None:
+            return
+        self._ready = asyncio.PriorityQueue()
+        for _ in range(self.workers):
+            task = asyncio.create_task(self._worker(self._ready))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._ready = None
+        self.rooms.clear()
+
+    def stats(self) -> dict[int, RoomDispatchStats]:
+        """各直播间的队列统计"""
+        return {room_id: room.stats for room_id, room in self.rooms.items()}
+
+    def latency_percentiles(
+        self, percentiles: tuple[float, ...] = (50, 90, 99)
+    ) -> dict[str, dict[float, float]]:
+        """各事件类从入队到开始处理的延迟分位数（秒）"""
+        return {
+            name: recorder.percentiles(percentiles)
+            for name, recorder in self.latency.items()
+        }
+
+    def priority_of(self, event: Event) -> Priority:
+        """按事件类及其父类的名称查找优先级"""
+        event_type = type(event)
+        priority = self._priority_cache.get(event_type)
+        if priority is None:
+            priority = next(
+                (
+                    self.priorities[cls.__name__]
+                    for cls in event_type.__mro__
+                    if cls.__name__ in self.priorities
+                ),
+                Priority.NORMAL,
+            )
+            self._priority_cache[event_type] = priority
+        return priority
+
+    async def put(self, bot: Bot, event: Event, room_id: int) -> None:
+        """将事件放入直播间队列，队列已满时按溢出策略处理"""
+        self.start()
+        room = self.rooms.get(room_id)
+        if room is None:
+            room = self.rooms[room_id] = _RoomQueue(room_id)
+        level = self.priority_of(event)
+        if room.size >= self.queue_size:
+            if self.overflow == "block":
+                while room.size >= self.queue_size:
+                    room.not_full.clear()
+                    await room.not_full.wait()
+            elif not self._make_room(room, level):
+                self._dropped(room)
+                return
+        room.queues[level].append(_Item(next(self._seq), bot, event, time.monotonic()))
+        room.size += 1
+        stats = room.stats
+        stats.enqueued += 1
+        stats.depth = room.size
+        stats.max_depth = max(stats.max_depth, stats.depth)
+        if not (self.ordered and room.busy):
+            self._schedule(room)
+
+    def _make_room(self, room: _RoomQueue, level: int) -> bool:
+        """按溢出策略腾出一个位置，返回是否应当接收优先级为 `level` 的新事件"""
+        evict = room.oldest_level()
+        if self.overflow == "drop_low_priority":
+            evict = room.worst_level()
+            if evict is None or evict <= level:
+                # nothing queued is less important than the incoming event
+                return False
+        if evict is not None:
+            room.pop(evict)
+            self._dropped(room)
+        return True
+
+    def _dropped(self, room: _RoomQueue) -> None:
+        stats = room.stats
+        stats.dropped += 1
+        if stats.dropped == 1 or not stats.dropped % DROP_WARNING_EVERY:
+            log(
+                "WARNING",
+                f"Event queue of room {room.room_id} is full, dropped "
+                f"{stats.dropped} events so far ({self.overflow})",
+            )
+
+    def _schedule(self, room: _RoomQueue) -> None:
+        """按直播间当前最高的待处理优先级放入就绪队列"""
+        level = room.best_level()
+        if level is None or self._ready is None:
+            room.entry = None
+            return
+        if room.entry is not None and room.entry[0] <= level:
+            return
+        # the previous entry, if any, is left in the heap and skipped later
+        room.entry = [level, next(self._seq), room]
+        self._ready.put_nowait(room.entry)
+
+    async def _worker(self, ready: asyncio.PriorityQueue[list]) -> None:
+        while True:
+            entry = await ready.get()
+            room: _RoomQueue = entry[2]
+            if room.entry is not entry:
+                continue
+            room.entry = None
+            level = room.oldest_level() if self.ordered else room.best_level()
+            if level is None:
+                continue
+            item = room.pop(level)
+            if self.ordered:
+                room.busy = True
+            else:
+                # let other workers take the next event of this room right away
+                self._schedule(room)
+            name = type(item.event).__name__
+            recorder = self.latency.get(name)
+            if recorder is None:
+                recorder = self.latency[name] = LatencyRecorder()
+            recorder.record(time.monotonic() - item.enqueued)
+            try:
+                await item.bot._handle_event(item.event)
+            except Exception as e:
+                log(
+                    "ERROR",
+                    f"Error while handling event for room {room.room_id}",
+                    e,
+                )
+            room.stats.handled += 1
+            if self.ordered:
+                # no other worker could start on this room while it was busy
+                room.busy = False
+                self._schedule(room)
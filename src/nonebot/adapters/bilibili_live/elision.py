@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from collections.abc import Hashable
+import types
+from typing import Annotated, Any, Union, get_args, get_origin
+
+from nonebot.adapters import Event as BaseEvent
+
+from .event import (
+    COMMAND_TO_EVENT,
+    Event,
+    HeartbeatEvent,
+    MessageEvent,
+    MetaEvent,
+    NoticeEvent,
+)
+from .log import log
+
+from nonebot.dependencies import Dependent
+from nonebot.matcher import Matcher, matchers
+from nonebot.params import EventParam
+from nonebot.rule import IsTypeRule
+
+try:
+    from nonebot.message import _event_postprocessors, _event_preprocessors
+except ImportError:  # private in nonebot, elision is turned off without them
+    _event_preprocessors = _event_postprocessors = None
+
+_UNION_ORIGINS = {Union, getattr(types, "UnionType", Union)}
+
+_EVENT_TYPES: tuple[tuple[type[Event], str], ...] = (
+    (MessageEvent, "message"),
+    (NoticeEvent, "notice"),
+    (MetaEvent, "metaevent"),
+)
+
+
+def _event_type(model: type[Event]) -> str | None:
+    for base, event_type in _EVENT_TYPES:
+        if issubclass(model, base):
+            return event_type
+    return None
+
+
+def _annotation_accepts(annotation: Any, model: type[Event]) -> bool:
+    """事件类的实例能否通过参数类型注解的检查，无法判断时视为可以"""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _annotation_accepts(get_args(annotation)[0], model)
+    if origin in _UNION_ORIGINS:
+        return any(_annotation_accepts(arg, model) for arg in get_args(annotation))
+    if annotation is None or annotation is type(None):
+        return False
+    if isinstance(annotation, type) and issubclass(annotation, BaseEvent):
+        return issubclass(model, annotation)
+    return True
+
+
+def _dependent_accepts(dependent: Dependent[Any], model: type[Event]) -> bool:
+    call = dependent.call
+    if isinstance(call, IsTypeRule) and not issubclass(model, call.types):
+        return False
+    for param in dependent.params:
+        checker = getattr(param.field_info, "checker", None)
+        if (
+            isinstance(param.field_info, EventParam)
+            and checker is not None
+            and not _annotation_accepts(checker.annotation, model)
+        ):
+            return False
+    return True
+
+
+def matcher_accepts(matcher: type[Matcher], model: type[Event]) -> bool:
+    """事件响应器是否可能处理该事件类"""
+    if matcher.type and matcher.type != _event_type(model):
+        return False
+    if not all(_dependent_accepts(c, model) for c in matcher.rule.checkers):
+        return False
+    return not matcher.handlers or any(
+        _dependent_accepts(handler, model) for handler in matcher.handlers
+    )
+
+
+class EventElider:
+    """跳过没有事件响应器能够处理的事件
+
+    根据已注册的事件响应器的类型、`is_type` 规则以及处理函数的事件参数注解，
+    计算每个事件类是否可能被处理。存在事件预处理或后处理函数时不跳过任何事件。
+    事件响应器变化后会在下次检查时重新计算。
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        derived: dict[type[Event], tuple[type[Event], ...]] | None = None,
+    ) -> None:
+        if enabled and _event_preprocessors is None:
+            log("WARNING", "Event elision is not supported by this NoneBot version")
+            enabled = False
+        self.enabled = enabled
+        self.derived = derived or {}
+        """由适配器从某事件类派生出的其他事件类，任一可被处理时不跳过原事件"""
+        self.elided: set[type[Event]] = set()
+        self.elided_commands: set[str] = set()
+        self._fingerprint: Hashable = None
+
+    def accepts(self, model: type[Event]) -> bool:
+        return model not in self.elided
+
+    def accepts_command(self, cmd: str) -> bool | None:
+        """命令的所有事件类都被跳过时返回 `False`，否则需要解析后再判断"""
+        return False if cmd in self.elided_commands else None
+
+    def check(self) -> None:
+        """事件响应器有变化时重新计算"""
+        if not self.enabled:
+            return
+        assert _event_preprocessors is not None
+        assert _event_postprocessors is not None
+        # compare the matchers themselves, replacing one keeps the counts equal
+        fingerprint = (
+            tuple((priority, tuple(group)) for priority, group in matchers.items()),
+            frozenset(_event_preprocessors),
+            frozenset(_event_postprocessors),
+        )
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self.refresh()
+
+    def refresh(self) -> None:
+        elided: set[type[Event]] = set()
+        if not (_event_preprocessors or _event_postprocessors):
+            registered = [m for group in matchers.values() for m in group]
+            models = {
+                HeartbeatEvent,
+                *(
+                    m
+                    for route in COMMAND_TO_EVENT.values()
+                    for m in route.models.values()
+                ),
+            }
+            elided = {
+                model
+                for model in models
+                if not any(
+                    matcher_accepts(m, target)
+                    for target in (model, *self.derived.get(model, ()))
+                    for m in registered
+                )
+            }
+        elided_commands = {
+            cmd
+            for cmd, route in COMMAND_TO_EVENT.items()
+            if all(model in elided for model in route.models.values())
+        }
+        if elided != self.elided:
+            partial = sorted(
+                f"{cmd}({', '.join(sorted(m.__name__ for m in route_elided))})"
+                for cmd, route in COMMAND_TO_EVENT.items()
+                if cmd not in elided_commands
+                and (route_elided := set(route.models.values()) & elided)
+            )
+            log(
+                "DEBUG",
+                f"Elided {len(elided_commands)} commands without matchers: "
+                f"{', '.join(sorted(elided_commands)) or 'none'}"
+                + (f"; partially: {', '.join(partial)}" if partial else ""),
+            )
+        self.elided = elided
+        self.elided_commands = elided_commands
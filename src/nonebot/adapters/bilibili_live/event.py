@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 import base64
-import json
-from typing import Any, Callable, Literal, Optional, TypeVar, Union
+from collections.abc import Hashable
+from dataclasses import dataclass, field
+import time
+from typing import Any, Callable, Literal, Optional, TypeVar
 from typing_extensions import override
 
 from nonebot.adapters import Event as BaseEvent
 
+from . import codec
 from .exception import InteractionEndException
 from .log import log
 from .message import Emoticon, Message, MessageSegment
@@ -32,25 +35,63 @@ from betterproto import (
     Casing,
     Message as ProtoMessage,
 )
-from nonebot.compat import model_dump, model_validator, type_validate_python
+from nonebot.compat import (
+    PYDANTIC_V2,
+    model_dump,
+    model_validator,
+    type_validate_python,
+)
 from nonebot.utils import escape_tag
 
-COMMAND_TO_EVENT: dict[str, type] = {}
+Discriminator = Callable[[dict[str, Any]], Hashable]
+
+
+@dataclass
+class EventRoute:
+    """命令到事件类的路由
+
+    同一命令对应多个事件类时，由 `discriminator` 从数据中取出判别值，
+    再从 `models` 中选出唯一的事件类进行校验。
+    """
+
+    discriminator: Discriminator | None = None
+    models: dict[Hashable, type[Event]] = field(default_factory=dict)
+
+    def resolve(self, data: dict[str, Any]) -> type[Event] | None:
+        if self.discriminator is None:
+            return self.models.get(None)
+        try:
+            key = self.discriminator(data)
+        except (KeyError, TypeError, ValueError):
+            return None
+        return self.models.get(key)
+
+
+COMMAND_TO_EVENT: dict[str, EventRoute] = {}
 COMMAND_TO_PB: dict[str, type[ProtoMessage]] = {}
 
+INTERACTION_END_CMD = "LIVE_OPEN_PLATFORM_INTERACTION_END"
+
 
 T = TypeVar("T")
 
 
 def cmd(
-    cmd: str, proto: type[ProtoMessage] | None = None
+    cmd: str,
+    proto: type[ProtoMessage] | None = None,
+    *,
+    discriminator: Discriminator | None = None,
+    key: Hashable = None,
 ) -> Callable[[type[T]], type[T]]:
     def wrapper(cls: type[T]) -> type[T]:
-        origin = COMMAND_TO_EVENT.get(cmd)
-        if origin is None:
-            COMMAND_TO_EVENT[cmd] = cls
-        else:
-            COMMAND_TO_EVENT[cmd] = Union[origin, cls]
+        route = COMMAND_TO_EVENT.setdefault(cmd, EventRoute(discriminator))
+        if route.discriminator is not discriminator:
+            raise TypeError(f"Command {cmd} registered with another discriminator")
+        if key in route.models:
+            raise TypeError(
+                f"Command {cmd} already routes {key!r} to {route.models[key]!r}"
+            )
+        route.models[key] = cls  # pyright: ignore[reportArgumentType]
         if proto is not None:
             COMMAND_TO_PB[cmd] = proto
         return cls
@@ -227,7 +268,7 @@ class DanmakuEvent(MessageEvent):
             font_size = 0
         else:
             # Web DM
-            extra = json.loads(data["info"][0][15]["extra"])
+            extra = codec.loads(data["info"][0][15]["extra"])
             emots = extra["emots"]
             content = data["info"][1]
             user = data["info"][0][15]["user"]
@@ -438,6 +479,10 @@ def _interact_word_validator(data: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _interact_word_type(data: dict[str, Any]) -> int:
+    return int(data["data"]["msg_type"])
+
+
 class _InteractWordEvent(NoticeEvent):
     msg_type: int
     timestamp: int
@@ -459,8 +504,8 @@ class _InteractWordEvent(NoticeEvent):
         return _interact_word_validator(data)
 
 
-@cmd("INTERACT_WORD")
-@cmd("INTERACT_WORD_V2", InteractWordV2)
+@cmd("INTERACT_WORD", discriminator=_interact_word_type, key=1)
+@cmd("INTERACT_WORD_V2", InteractWordV2, discriminator=_interact_word_type, key=1)
 @cmd("LIVE_OPEN_PLATFORM_LIVE_ROOM_ENTER")
 class UserEnterEvent(_InteractWordEvent):
     open_id: str = ""
@@ -498,8 +543,8 @@ class UserEnterEvent(_InteractWordEvent):
         return str(self.uid) if self.open_id == "" else self.open_id
 
 
-@cmd("INTERACT_WORD")
-@cmd("INTERACT_WORD_V2", InteractWordV2)
+@cmd("INTERACT_WORD", discriminator=_interact_word_type, key=2)
+@cmd("INTERACT_WORD_V2", InteractWordV2, discriminator=_interact_word_type, key=2)
 class UserFollowEvent(_InteractWordEvent, WebOnlyEvent):
     msg_type: Literal[2, "2"] = 2
 
@@ -512,8 +557,8 @@ class UserFollowEvent(_InteractWordEvent, WebOnlyEvent):
         return f"[Room@{self.room_id}] {self.uname} Followed the room"
 
 
-@cmd("INTERACT_WORD")
-@cmd("INTERACT_WORD_V2", InteractWordV2)
+@cmd("INTERACT_WORD", discriminator=_interact_word_type, key=3)
+@cmd("INTERACT_WORD_V2", InteractWordV2, discriminator=_interact_word_type, key=3)
 class UserShareEvent(_InteractWordEvent, WebOnlyEvent):
     msg_type: Literal[3, "3"] = 3
 
@@ -772,6 +817,7 @@ class LikeEvent(NoticeEvent):
     uface: str = ""
     timestamp: Optional[int] = None
     like_count: Optional[int] = None
+    msg_id: str = ""
 
     @model_validator(mode="before")
     @classmethod
@@ -787,6 +833,7 @@ class LikeEvent(NoticeEvent):
                 "uface": data["data"]["uface"],
                 "timestamp": data["data"]["timestamp"],
                 "like_count": data["data"]["like_count"],
+                "msg_id": data["data"].get("msg_id", ""),
                 "room_id": data["room_id"],
                 "fans_medal": _open_medal_validator(data["data"]),
             }
@@ -813,6 +860,10 @@ class LikeEvent(NoticeEvent):
         return str(self.uid) if self.open_id == "" else self.open_id
 
 
+def _dm_interaction_type(data: dict[str, Any]) -> int:
+    return int(data["data"]["type"])
+
+
 class _DMInteraction(NoticeEvent, WebOnlyEvent):
     id: int
     status: int
@@ -823,7 +874,7 @@ class _DMInteraction(NoticeEvent, WebOnlyEvent):
     def validate(cls, data: dict[str, Any] | Any) -> Any:
         if not isinstance(data, dict):
             return data
-        data_ = json.loads(data["data"]["data"])
+        data_ = codec.loads(data["data"]["data"])
         return {
             "room_id": data["room_id"],
             **data["data"],
@@ -831,7 +882,7 @@ class _DMInteraction(NoticeEvent, WebOnlyEvent):
         }
 
 
-@cmd("DM_INTERACTION")
+@cmd("DM_INTERACTION", discriminator=_dm_interaction_type, key=101)
 class InteractionVote(_DMInteraction):
     """投票互动事件"""
 
@@ -874,7 +925,7 @@ class InteractionVote(_DMInteraction):
         return f"[Room@{self.room_id}] Vote: {self.question} -> {self.result_text}"
 
 
-@cmd("DM_INTERACTION")
+@cmd("DM_INTERACTION", discriminator=_dm_interaction_type, key=102)
 class InteractionDanmaku(_DMInteraction):
     """弹幕互动事件"""
 
@@ -893,7 +944,7 @@ class InteractionDanmaku(_DMInteraction):
         return "interaction_danmaku"
 
 
-@cmd("DM_INTERACTION")
+@cmd("DM_INTERACTION", discriminator=_dm_interaction_type, key=103)
 class InteractionFollow(_DMInteraction):
     """关注互动事件"""
 
@@ -920,7 +971,7 @@ class InteractionFollow(_DMInteraction):
         return f"[Room@{self.room_id}] {self.cnt}{self.suffix_text}"
 
 
-@cmd("DM_INTERACTION")
+@cmd("DM_INTERACTION", discriminator=_dm_interaction_type, key=104)
 class InteractionGift(_DMInteraction):
     """送礼互动事件"""
 
@@ -951,7 +1002,7 @@ class InteractionGift(_DMInteraction):
         return f"[Room@{self.room_id}] {self.cnt}{self.suffix_text}"
 
 
-@cmd("DM_INTERACTION")
+@cmd("DM_INTERACTION", discriminator=_dm_interaction_type, key=105)
 class InteractionShare(_DMInteraction):
     """分享互动事件"""
 
@@ -978,7 +1029,7 @@ class InteractionShare(_DMInteraction):
         return f"[Room@{self.room_id}] {self.cnt}{self.suffix_text}"
 
 
-@cmd("DM_INTERACTION")
+@cmd("DM_INTERACTION", discriminator=_dm_interaction_type, key=106)
 class InteractionLike(_DMInteraction):
     """点赞互动事件"""
 
@@ -1500,12 +1551,152 @@ class RoomAdminRevokeEvent(NoticeEvent, WebOnlyEvent):
         return str(self.uid)
 
 
-def packet_to_event(packet: Packet, room_id: int) -> Event:
+# batched events
+
+
+class _BatchEvent(NoticeEvent):
+    count: int
+    """合并的事件数"""
+    start_time: float
+    """窗口内第一个事件的到达时间戳"""
+    end_time: float
+    """窗口内最后一个事件的到达时间戳"""
+
+
+class LikeBatchEvent(_BatchEvent):
+    """一个窗口内合并的点赞事件"""
+
+    like_count: int
+    """点赞总数"""
+    user_ids: list[str]
+    """点赞用户的 ID（去重，最多保留前若干个）"""
+
+    @override
+    def get_event_name(self) -> str:
+        return "like_batch"
+
+    @override
+    def get_event_description(self) -> str:
+        return (
+            f"[Room@{self.room_id}] {len(self.user_ids)} users "
+            f"liked {self.like_count} times"
+        )
+
+
+class UserEnterBatchEvent(_BatchEvent):
+    """一个窗口内合并的进入直播间事件"""
+
+    user_ids: list[str]
+    """进入直播间用户的 ID（去重，最多保留前若干个）"""
+
+    @override
+    def get_event_name(self) -> str:
+        return "user_enter_batch"
+
+    @override
+    def get_event_description(self) -> str:
+        return f"[Room@{self.room_id}] {self.count} users entered the room"
+
+
+class WatchedChangeBatchEvent(_BatchEvent, WebOnlyEvent):
+    """一个窗口内合并的看过人数变化事件，保留最后一次的数值"""
+
+    num: int
+    text_small: str
+    text_large: str
+
+    @override
+    def get_event_name(self) -> str:
+        return "watched_change_batch"
+
+    @override
+    def get_event_description(self) -> str:
+        return f"[Room@{self.room_id}] Watched people count change: {self.num}"
+
+
+class GiftComboCompletedEvent(NoticeEvent):
+    """一次连击送礼结束后合并的送礼事件"""
+
+    combo_id: str
+    """连击 ID"""
+    uid: int
+    uname: str
+    open_id: str = ""
+    gift_name: str
+    total_num: int
+    """礼物总数"""
+    total_price: float
+    """礼物总价值，单位与 `SendGiftEvent.price` 相同"""
+    count: int
+    """合并的送礼事件数"""
+    start_timestamp: int
+    end_timestamp: int
+
+    @override
+    def get_event_name(self) -> str:
+        return "gift_combo_completed"
+
+    @override
+    def get_event_description(self) -> str:
+        return (
+            f"[Room@{self.room_id}] [￥{self.total_price}] {self.uname} sent "
+            f"{self.total_num} {self.gift_name}(s) in a combo"
+        )
+
+    @override
+    def get_user_id(self) -> str:
+        return str(self.uid) if self.open_id == "" else self.open_id
+
+
+_VALIDATORS: dict[type[Event], Callable[[Any], Event]] = {}
+
+
+def _build_validator(model: type[Event]) -> Callable[[Any], Event]:
+    if PYDANTIC_V2:
+        from pydantic import TypeAdapter
+
+        return TypeAdapter(model).validate_python
+    return model.parse_obj  # pyright: ignore[reportDeprecated]
+
+
+def get_validator(model: type[Event]) -> Callable[[Any], Event]:
+    """获取事件类的校验函数，首次获取时构建并缓存"""
+    validator = _VALIDATORS.get(model)
+    if validator is None:
+        validator = _VALIDATORS[model] = _build_validator(model)
+    return validator
+
+
+def warmup_validators() -> float:
+    """为所有已注册的事件类预先构建校验函数，返回耗时（秒）"""
+    start = time.perf_counter()
+    for route in COMMAND_TO_EVENT.values():
+        for model in route.models.values():
+            get_validator(model)
+    return time.perf_counter() - start
+
+
+def is_known_command(cmd: str) -> bool:
+    """Whether packets of `cmd` can produce an event or are handled internally."""
+    return cmd in COMMAND_TO_EVENT or cmd == INTERACTION_END_CMD
+
+
+def packet_to_event(
+    packet: Packet,
+    room_id: int,
+    accept: Callable[[str, type[Event]], bool] | None = None,
+) -> Event | None:
+    """将数据包转换为事件
+
+    `accept` 拒绝解析出的事件类时跳过校验并返回 `None`。
+    """
     data = packet.decode_dict()
     cmd = data.get("cmd", "")
     if packet.opcode == OpCode.HeartbeatReply.value:
+        if accept is not None and not accept(cmd, HeartbeatEvent):
+            return None
         return HeartbeatEvent(popularity=data["popularity"], room_id=room_id)
-    elif cmd == "LIVE_OPEN_PLATFORM_INTERACTION_END":
+    elif cmd == INTERACTION_END_CMD:
         raise InteractionEndException(
             data["data"]["game_id"], data["data"]["timestamp"]
         )
@@ -1522,7 +1713,9 @@ def packet_to_event(packet: Packet, room_id: int) -> Event:
             )
         data["room_id"] = room_id
         log("TRACE", f"[{cmd}] Receive: {escape_tag(str(data))}")
-        event_model = COMMAND_TO_EVENT.get(cmd)
-        if event_model:
-            return type_validate_python(event_model, data)
+        route = COMMAND_TO_EVENT.get(cmd)
+        if route and (event_model := route.resolve(data)):
+            if accept is not None and not accept(cmd, event_model):
+                return None
+            return get_validator(event_model)(data)
     raise RuntimeError(f"Unknown packet opcode: {packet.opcode} or command: {cmd}")
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from typing_extensions import override
+
+from .coalesce import BATCH_EVENTS
+from .event import COMMAND_TO_EVENT, Event, GiftComboCompletedEvent, HeartbeatEvent
+
+
+def known_filter_names() -> set[str]:
+    """可以用于过滤的命令名和事件类名，包括适配器合并得到的事件类"""
+    names = set(COMMAND_TO_EVENT)
+    for model in (
+        HeartbeatEvent,
+        GiftComboCompletedEvent,
+        *BATCH_EVENTS.values(),
+        *(m for route in COMMAND_TO_EVENT.values() for m in route.models.values()),
+    ):
+        names.update(cls.__name__ for cls in model.__mro__ if issubclass(cls, Event))
+    return names
+
+
+class EventFilter:
+    """按命令名或事件类名过滤事件
+
+    事件类名对其子类同样生效。`include` 为空时不限制，
+    命令或事件类同时出现在 `include` 和 `exclude` 中时以 `exclude` 为准。
+    适配器合并得到的事件（如 `LikeBatchEvent`）按其自身的类名过滤，
+    被接受时其来源事件同样会被解析，但来源事件本身是否分发仍按来源事件过滤。
+    """
+
+    def __init__(
+        self,
+        include: Iterable[str] = (),
+        exclude: Iterable[str] = (),
+        derived: Mapping[type[Event], tuple[type[Event], ...]] | None = None,
+    ):
+        self.include = frozenset(include)
+        self.exclude = frozenset(exclude)
+        self.derived = derived or {}
+        """由适配器从某事件类派生出的其他事件类"""
+        self._commands: dict[str, bool | None] = {}
+        self._models: dict[tuple[str, type[Event]], bool] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    def accepts(self, cmd: str, model: type[Event]) -> bool:
+        """是否处理由命令 `cmd` 得到的事件类 `model`"""
+        key = (cmd, model)
+        result = self._models.get(key)
+        if result is None:
+            names = {cmd, *(cls.__name__ for cls in model.__mro__)}
+            if names & self.exclude:
+                result = False
+            else:
+                result = not self.include or bool(names & self.include)
+            self._models[key] = result
+        return result
+
+    def accepts_derived(self, model: type[Event]) -> bool:
+        """是否接受由事件类 `model` 派生的任一事件类"""
+        return any(
+            self.accepts(target.__name__, target)
+            for target in self.derived.get(model, ())
+        )
+
+    def wants(self, cmd: str, model: type[Event]) -> bool:
+        """是否需要解析由命令 `cmd` 得到的事件类 `model`
+
+        事件本身或由它派生的任一事件被接受时都需要解析。
+        """
+        return self.accepts(cmd, model) or self.accepts_derived(model)
+
+    def accepts_command(self, cmd: str) -> bool | None:
+        """只看命令名能否确定是否处理
+
+        命令对应的事件类全部被接受或全部被拒绝时返回对应的结果，
+        需要先解析数据才能确定事件类时返回 `None`。
+        """
+        if cmd in self._commands:
+            return self._commands[cmd]
+        route = COMMAND_TO_EVENT.get(cmd)
+        results = {self.wants(cmd, m) for m in route.models.values()} if route else ()
+        result = next(iter(results)) if len(results) == 1 else None
+        self._commands[cmd] = result
+        return result
+
+    def unknown_names(self) -> frozenset[str]:
+        return (self.include | self.exclude) - known_filter_names()
+
+
+class EventFilterUnion(EventFilter):
+    """任一过滤器接受即接受，用于多个 Bot 共享同一直播间连接时决定是否解析"""
+
+    def __init__(self, filters: Iterable[EventFilter]):
+        super().__init__()
+        self.filters = tuple(filters)
+
+    @classmethod
+    def of(cls, filters: Iterable[EventFilter | None]) -> EventFilter | None:
+        """合并多个过滤器，其中任一为 `None`（不过滤）时返回 `None`"""
+        collected: list[EventFilter] = []
+        for event_filter in filters:
+            if event_filter is None:
+                return None
+            collected.append(event_filter)
+        return cls(collected)
+
+    @override
+    def __bool__(self) -> bool:
+        return True
+
+    @override
+    def accepts(self, cmd: str, model: type[Event]) -> bool:
+        return any(f.accepts(cmd, model) for f in self.filters)
+
+    @override
+    def wants(self, cmd: str, model: type[Event]) -> bool:
+        return any(f.wants(cmd, model) for f in self.filters)
+
+    @override
+    def accepts_command(self, cmd: str) -> bool | None:
+        results = {f.accepts_command(cmd) for f in self.filters}
+        if True in results:
+            return True
+        return False if results == {False} else None
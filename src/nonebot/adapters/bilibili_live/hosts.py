@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+import time
+from typing import Any
+
+from .log import log
+from .stats import HostStats
+
+PROBE_TIMEOUT = 3
+PROBE_INTERVAL = 300
+"""重新测量服务器 TCP 连接耗时的间隔（秒）"""
+HEALTHY_SESSION = 60
+"""连接保持时间短于该值（秒）时视为服务器异常"""
+RTT_SMOOTHING = 0.3
+
+
+def host_key(host: dict[str, Any]) -> str:
+    return f"{host['host']}:{host['wss_port']}"
+
+
+class HostSelector:
+    """在 `getDanmuInfo` 返回的服务器列表中选择连接的服务器
+
+    优先选择连续失败次数少、TCP 连接耗时短的服务器。耗时只通过 TCP 连接测量，
+    每 `PROBE_INTERVAL` 秒重新测量一次，实际 WebSocket 握手的耗时单独记录，不参与排序。
+    连接失败的服务器会排到后面，重连时自动轮换到下一个服务器。
+    """
+
+    def __init__(self, probe: bool = True) -> None:
+        self.probe_enabled = probe
+        self.hosts: dict[str, HostStats] = {}
+
+    def stats(self, host: dict[str, Any]) -> HostStats:
+        key = host_key(host)
+        stats = self.hosts.get(key)
+        if stats is None:
+            stats = self.hosts[key] = HostStats()
+        return stats
+
+    def order(self, hosts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """按优先级排序服务器，相同优先级时保持原顺序"""
+
+        def rank(item: tuple[int, dict[str, Any]]) -> tuple[int, float, int]:
+            index, host = item
+            stats = self.stats(host)
+            rtt = stats.rtt if stats.rtt is not None else float("inf")
+            return stats.consecutive_failures, rtt, index
+
+        return [host for _, host in sorted(enumerate(hosts), key=rank)]
+
+    async def probe(self, hosts: list[dict[str, Any]]) -> None:
+        """并发测量尚未测量过或测量结果已过时的服务器的 TCP 连接耗时"""
+        if not self.probe_enabled:
+            return
+        deadline = time.monotonic() - PROBE_INTERVAL
+        stale = [
+            host
+            for host in hosts
+            if (probed := self.stats(host).probed) is None or probed < deadline
+        ]
+        if stale:
+            await asyncio.gather(*(self._probe(host) for host in stale))
+
+    def record_success(self, host: dict[str, Any], handshake_rtt: float) -> None:
+        stats = self.stats(host)
+        stats.connects += 1
+        stats.consecutive_failures = 0
+        if stats.handshake_rtt is None:
+            stats.handshake_rtt = handshake_rtt
+        else:
+            stats.handshake_rtt += (handshake_rtt - stats.handshake_rtt) * RTT_SMOOTHING
+
+    def record_failure(self, host: dict[str, Any]) -> None:
+        stats = self.stats(host)
+        stats.failures += 1
+        stats.consecutive_failures += 1
+
+    @staticmethod
+    def _update_rtt(stats: HostStats, rtt: float) -> None:
+        if stats.rtt is None:
+            stats.rtt = rtt
+        else:
+            stats.rtt += (rtt - stats.rtt) * RTT_SMOOTHING
+
+    async def _probe(self, host: dict[str, Any]) -> None:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self.stats(host).probed = time.monotonic()
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host["host"], host["wss_port"]),
+                PROBE_TIMEOUT,
+            )
+        except (OSError, asyncio.TimeoutError) as e:
+            log("DEBUG", f"Probing {host_key(host)} failed", e)
+            self.record_failure(host)
+            return
+        self._update_rtt(self.stats(host), loop.time() - start)
+        writer.close()
+        with suppress(OSError):
+            await writer.wait_closed()
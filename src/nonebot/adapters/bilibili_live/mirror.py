@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import time
+from typing import Any
+
+from .hosts import host_key
+from .packet import Packet
+from .stats import MirrorStats
+
+MIRROR_CAPACITY = 4096
+MIRROR_WINDOW = 3.0
+"""两条连接收到同一数据包的最大间隔（秒），超过后不再视为重复"""
+
+
+class RoomMirror:
+    """同一直播间多条冗余连接之间的数据包去重
+
+    每条连接收到的数据包都会先经过这里。某条连接收到的数据包如果另一条连接在
+    `window` 秒内已经收到过且尚未匹配，视为重复并丢弃；否则交给后续处理并等待
+    另一条连接匹配。同一条连接重复收到内容相同的数据包时会累计，不会被当作重复。
+    """
+
+    def __init__(
+        self, capacity: int = MIRROR_CAPACITY, window: float = MIRROR_WINDOW
+    ) -> None:
+        self.capacity = capacity
+        self.window = window
+        self.stats = MirrorStats()
+        self._pending: OrderedDict[tuple[int, bytes], list] = OrderedDict()
+        """数据包摘要到 `[先收到的连接, 尚未匹配的数量, 最近收到的时间]`"""
+        self.hosts: dict[int, str] = {}
+        """各条连接当前使用的服务器"""
+
+    def link(self, index: int) -> MirrorLink:
+        return MirrorLink(self, index)
+
+    def accept(self, link: int, packet: Packet) -> bool:
+        """是否应当处理连接 `link` 收到的数据包"""
+        now = time.monotonic()
+        self._expire(now)
+        key = (packet.opcode, hashlib.blake2b(packet.data, digest_size=16).digest())
+        pending = self._pending.get(key)
+        stats = self.stats
+        if pending is not None and pending[0] != link:
+            pending[1] -= 1
+            if not pending[1]:
+                del self._pending[key]
+            stats.duplicates += 1
+            return False
+        if pending is None:
+            self._pending[key] = [link, 1, now]
+            if len(self._pending) > self.capacity:
+                self._pending.popitem(last=False)
+                stats.evicted += 1
+        else:
+            pending[1] += 1
+            pending[2] = now
+            self._pending.move_to_end(key)
+        stats.forwarded += 1
+        return True
+
+    def _expire(self, now: float) -> None:
+        # entries are kept in the order they were last seen
+        pending = self._pending
+        deadline = now - self.window
+        while pending:
+            key, entry = next(iter(pending.items()))
+            if entry[2] > deadline:
+                break
+            del pending[key]
+            self.stats.expired += 1
+
+
+class MirrorLink:
+    """冗余连接中的一条"""
+
+    __slots__ = ("index", "mirror")
+
+    def __init__(self, mirror: RoomMirror, index: int) -> None:
+        self.mirror = mirror
+        self.index = index
+
+    def accept(self, packet: Packet) -> bool:
+        return self.mirror.accept(self.index, packet)
+
+    def choose_host(self, hosts: list[dict[str, Any]]) -> dict[str, Any]:
+        """从排好序的服务器中选择其他连接没有在使用的第一个服务器"""
+        hosts_in_use = self.mirror.hosts
+        taken = {key for index, key in hosts_in_use.items() if index != self.index}
+        host = next((h for h in hosts if host_key(h) not in taken), hosts[0])
+        hosts_in_use[self.index] = host_key(host)
+        return host
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
 from dataclasses import dataclass
 from enum import IntEnum
-import json
+import re
 import struct
 from typing import Any
 import zlib
 
+from . import codec
+
 import brotli
 
 
@@ -25,17 +28,55 @@ class OpCode(IntEnum):
     Command = 5
 
 
-HEADER_LENGTH = 16
+HEADER = struct.Struct(">I2H2I")
+HEADER_LENGTH = HEADER.size
+
+_CMD_PATTERN = re.compile(rb'\s*\{\s*"cmd"\s*:\s*"([^"\\]*)"')
+
+_PROTOCOL_VERSIONS = {member.value: member for member in ProtocolVersion}
+_OPCODES = {member.value: member for member in OpCode}
+
+
+def _unpack_header(
+    buffer: bytes | bytearray | memoryview, offset: int = 0
+) -> tuple[int, int, ProtocolVersion, OpCode, int]:
+    length, header_length, protocol_version, opcode, seq = HEADER.unpack_from(
+        buffer, offset
+    )
+    if length < HEADER_LENGTH:
+        raise ValueError(f"Invalid packet length: {length}")
+    try:
+        return (
+            length,
+            header_length,
+            _PROTOCOL_VERSIONS[protocol_version],
+            _OPCODES[opcode],
+            seq,
+        )
+    except KeyError:
+        raise ValueError(
+            f"Unsupported protocol version {protocol_version} or opcode {opcode}"
+        ) from None
 
 
 @dataclass
 class Packet:
+    __slots__ = (
+        "data",
+        "header_length",
+        "length",
+        "opcode",
+        "protocol_version",
+        "seq",
+    )
+
     length: int
     header_length: int
     protocol_version: ProtocolVersion
     opcode: OpCode
     seq: int
-    data: bytes
+    data: bytes | memoryview
+    """Packet body, a view into the frame when produced by `split_frame`."""
 
     @classmethod
     def new(
@@ -46,7 +87,7 @@ class Packet:
         protocol_version: ProtocolVersion = ProtocolVersion.Normal,
     ) -> "Packet":
         """Create a new packet instance."""
-        raw = json.dumps(data).encode("utf-8")
+        raw = codec.dumps_bytes(data)
         return cls(
             length=len(raw) + HEADER_LENGTH,
             header_length=HEADER_LENGTH,
@@ -75,12 +116,11 @@ class Packet:
         )
 
     def to_bytes(self) -> bytes:
-        header = struct.pack(
-            ">I2H2I",
+        header = HEADER.pack(
             self.length,
             self.header_length,
-            self.protocol_version.value,
-            self.opcode.value,
+            self.protocol_version,
+            self.opcode,
             self.seq,
         )
         return header + self.data
@@ -89,82 +129,169 @@ class Packet:
     def from_bytes(cls, payload: bytes) -> "Packet":
         if len(payload) < HEADER_LENGTH:
             raise ValueError("Data too short to be a valid packet")
-        (
+        length, header_length, protocol_version, opcode, seq = _unpack_header(payload)
+        return cls(
             length,
             header_length,
             protocol_version,
             opcode,
             seq,
-        ) = struct.unpack(">I2H2I", payload[:HEADER_LENGTH])
-        protocol_version = ProtocolVersion(protocol_version)
-        if protocol_version not in ProtocolVersion:
-            raise ValueError(f"Unsupported protocol version: {protocol_version}")
+            payload[HEADER_LENGTH:length],
+        )
 
+    @classmethod
+    def from_buffer(cls, buffer: memoryview, offset: int = 0) -> "Packet":
+        """Parse a packet from `buffer` at `offset` without copying the body."""
+        if len(buffer) - offset < HEADER_LENGTH:
+            raise ValueError("Data too short to be a valid packet")
+        length, header_length, protocol_version, opcode, seq = _unpack_header(
+            buffer, offset
+        )
         return cls(
-            length=length,
-            header_length=header_length,
-            protocol_version=ProtocolVersion(protocol_version),
-            opcode=OpCode(opcode),
-            seq=seq,
-            data=payload[HEADER_LENGTH:length],
+            length,
+            header_length,
+            protocol_version,
+            opcode,
+            seq,
+            buffer[offset + HEADER_LENGTH : offset + length],
+        )
+
+    def detach(self) -> "Packet":
+        """Return a packet owning a copy of its body.
+
+        Packets yielded by `split_frame` only borrow the frame they were cut
+        from; call this before keeping one beyond the frame's lifetime.
+        """
+        if isinstance(self.data, bytes):
+            return self
+        return Packet(
+            length=self.length,
+            header_length=self.header_length,
+            protocol_version=self.protocol_version,
+            opcode=self.opcode,
+            seq=self.seq,
+            data=self.data.tobytes(),
         )
 
+    @property
+    def is_compressed(self) -> bool:
+        return self.protocol_version in (ProtocolVersion.Zlib, ProtocolVersion.Brotli)
+
     def decode_data(self) -> dict[str, Any] | list["Packet"]:
         """Decode the data field of the packet."""
-        if self.protocol_version == ProtocolVersion.Zlib:
-            decompressed = zlib.decompress(self.data)
-            return self._parse_multiple_packets(decompressed)
-        elif self.protocol_version == ProtocolVersion.Brotli:
-            decompressed = brotli.decompress(self.data)
-            return self._parse_multiple_packets(decompressed)
+        if self.is_compressed:
+            return list(self.iter_packets())
         elif self.opcode == OpCode.HeartbeatReply:
             return {
                 "popularity": int.from_bytes(self.data[0:4], "big"),
-                "payload": self.data[4:],
+                "payload": bytes(self.data[4:]),
             }
         else:
-            return json.loads(self.data.decode("utf-8"))
+            return codec.loads(self.data)
+
+    def peek_cmd(self) -> str | None:
+        """Read `cmd` from the raw JSON body without parsing it.
+
+        Returns `None` when `cmd` is not the leading key of the body, in which
+        case only a full parse can tell.
+        """
+        if match := _CMD_PATTERN.match(self.data):
+            return match.group(1).decode()
+        return None
 
     def decode_dict(self) -> dict[str, Any]:
         d = self.decode_data()
         assert isinstance(d, dict), "Decoded data is not a dictionary"
         return d
 
-    def _parse_multiple_packets(self, data: bytes) -> list["Packet"]:
-        """Parse multiple packets from decompressed data."""
-        packets = []
-        offset = 0
-
-        while offset < len(data):
-            if len(data) - offset < HEADER_LENGTH:
-                break
-
-            # Parse packet header
-            (
-                length,
-                header_length,
-                protocol_version,
-                opcode,
-                seq,
-            ) = struct.unpack(">I2H2I", data[offset : offset + HEADER_LENGTH])
-
-            # Extract packet data
-            packet_data = data[offset + HEADER_LENGTH : offset + length]
-
-            # Create packet
-            packet = Packet(
-                length=length,
-                header_length=header_length,
-                protocol_version=ProtocolVersion(protocol_version),
-                opcode=OpCode(opcode),
-                seq=seq,
-                data=packet_data,
-            )
-
-            packets.append(packet)
-            offset += length
-
-        return packets
+    def iter_packets(self) -> Iterator["Packet"]:
+        """Decompress a Zlib/Brotli bundle and yield its inner packets.
+
+        The bundle is decompressed incrementally and every inner packet is
+        yielded as soon as it is complete, so the decompressed bundle is never
+        held in memory as a whole.
+        """
+        if self.protocol_version == ProtocolVersion.Zlib:
+            chunks = _iter_zlib(self.data)
+        elif self.protocol_version == ProtocolVersion.Brotli:
+            chunks = _iter_brotli(self.data)
+        else:
+            raise ValueError(f"Packet is not compressed: {self.protocol_version!r}")
+
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer += chunk
+            while len(buffer) >= HEADER_LENGTH:
+                length, header_length, protocol_version, opcode, seq = _unpack_header(
+                    buffer
+                )
+                if len(buffer) < length:
+                    break
+                yield Packet(
+                    length,
+                    header_length,
+                    protocol_version,
+                    opcode,
+                    seq,
+                    bytes(buffer[HEADER_LENGTH:length]),
+                )
+                del buffer[:length]
+
+
+HEARTBEAT_FRAME = Packet.new_binary(OpCode.Heartbeat, 0, b"").to_bytes()
+"""Heartbeat packets never change, so the frame is built once."""
+
+DECOMPRESS_CHUNK_SIZE = 16 * 1024
+
+
+def _iter_zlib(data: bytes | memoryview) -> Iterator[bytes]:
+    decompressor = zlib.decompressobj()
+    pending = data
+    while not decompressor.eof:
+        chunk = decompressor.decompress(pending, DECOMPRESS_CHUNK_SIZE)
+        pending = decompressor.unconsumed_tail
+        if chunk:
+            yield chunk
+        elif not pending:
+            break
+    if tail := decompressor.flush():
+        yield tail
+
+
+def _iter_brotli(data: bytes | memoryview) -> Iterator[bytes]:
+    decompressor = brotli.Decompressor()
+    try:
+        chunk = decompressor.process(data, output_buffer_limit=DECOMPRESS_CHUNK_SIZE)
+    except TypeError:
+        # brotli < 1.2 has no output limit, bound the output by feeding the
+        # input piece by piece instead
+        view = memoryview(data)
+        for offset in range(0, len(view), DECOMPRESS_CHUNK_SIZE // 8):
+            if chunk := decompressor.process(
+                view[offset : offset + DECOMPRESS_CHUNK_SIZE // 8]
+            ):
+                yield chunk
+        return
+    while chunk:
+        yield chunk
+        if decompressor.is_finished():
+            break
+        chunk = decompressor.process(b"", output_buffer_limit=DECOMPRESS_CHUNK_SIZE)
+
+
+def split_frame(frame: bytes | memoryview) -> Iterator[Packet]:
+    """Split a WebSocket frame into packets.
+
+    The frame is walked in place through a `memoryview`, so each packet body
+    is a view into `frame` instead of a copy of the remaining bytes.
+    Trailing bytes shorter than a header are ignored.
+    """
+    view = memoryview(frame)
+    offset = 0
+    while len(view) - offset >= HEADER_LENGTH:
+        packet = Packet.from_buffer(view, offset)
+        yield packet
+        offset += packet.length
 
 
 def new_auth_packet(room_id: int, uid: int, token: str, buvid3: str) -> Packet:
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """令牌桶限流
+
+    每秒补充 `rate` 个令牌，最多积攒 `burst` 个。令牌不足时按请求顺序预留，
+    调用方等待到预留的令牌补充完成。`rate` 不大于 0 时不限流。
+    """
+
+    def __init__(self, rate: float, burst: float = 1) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """预留一个令牌，返回需要等待的秒数"""
+        if self.rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
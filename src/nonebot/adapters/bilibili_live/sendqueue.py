@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable
+import random
+from typing import Callable
+
+from .exception import ActionFailed
+from .log import log
+from .ratelimit import TokenBucket
+from .stats import SendStats
+
+THROTTLE_CODES = frozenset({10030, 10031})
+"""发送过快时 `msg/send` 返回的错误码"""
+
+Sender = Callable[[int, str, int, int], Awaitable[None]]
+
+
+class _Outgoing:
+    __slots__ = ("futures", "mode", "reply_mid", "siblings", "text")
+
+    def __init__(
+        self,
+        text: str,
+        mode: int,
+        reply_mid: int,
+        futures: list[asyncio.Future[None]] | None = None,
+        siblings: list[asyncio.Future[None]] | None = None,
+    ) -> None:
+        self.text = text
+        self.mode = mode
+        self.reply_mid = reply_mid
+        self.futures = futures or [asyncio.get_running_loop().create_future()]
+        self.siblings = siblings or []
+        """其他部分的 Future，本条发送失败时取消"""
+
+    def pending(self) -> bool:
+        return any(not future.done() for future in self.futures)
+
+    def finish(self, error: BaseException | None = None) -> None:
+        for future in self.futures:
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+        if error is not None:
+            # the rest of a split danmaku makes no sense on its own
+            for future in self.siblings:
+                future.cancel()
+
+
+def split_text(text: str, max_length: int) -> list[str]:
+    """将超过 `max_length` 个字符的弹幕拆分为多条，`max_length` 不大于 0 时不拆分"""
+    if max_length <= 0 or len(text) <= max_length:
+        return [text]
+    return [text[i : i + max_length] for i in range(0, len(text), max_length)]
+
+
+class SendQueue:
+    """按直播间排队发送弹幕
+
+    每个直播间依次发送，发送前分别从直播间和账号的令牌桶中获取令牌。超长的弹幕会被拆分，
+    启用合并时排队中未被拆分的相邻弹幕在长度允许时合并为一条发送。因发送过快被限制时按指数退避重试。
+    """
+
+    def __init__(
+        self,
+        sender: Sender,
+        *,
+        room_rate: float,
+        room_burst: int,
+        account_rate: float,
+        account_burst: int,
+        max_length: int = 0,
+        merge: bool = False,
+        retries: int = 3,
+        retry_delay: float = 2,
+    ) -> None:
+        self.sender = sender
+        self.room_rate = room_rate
+        self.room_burst = room_burst
+        self.account_bucket = TokenBucket(account_rate, account_burst)
+        self.max_length = max_length
+        self.merge = merge
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.stats = SendStats()
+        self._queues: dict[int, deque[_Outgoing]] = {}
+        self._room_buckets: dict[int, TokenBucket] = {}
+        self._workers: dict[int, asyncio.Task[None]] = {}
+
+    def put(
+        self, room_id: int, text: str, mode: int = 1, reply_mid: int = 0
+    ) -> asyncio.Future[None]:
+        """将弹幕加入队列，返回在弹幕全部发送后完成的 Future"""
+        parts = split_text(text, self.max_length)
+        if len(parts) > 1:
+            self.stats.split += 1
+        queue = self._queues.setdefault(room_id, deque())
+        # only the first part replies to the user
+        items = [
+            _Outgoing(part, mode, reply_mid if index == 0 else 0)
+            for index, part in enumerate(parts)
+        ]
+        futures = [future for item in items for future in item.futures]
+        if len(items) > 1:
+            for item in items:
+                item.siblings = [f for f in futures if f not in item.futures]
+        queue.extend(items)
+        self.stats.queued += len(parts)
+        if room_id not in self._workers:
+            self._workers[room_id] = asyncio.create_task(self._run(room_id))
+        return futures[0] if len(futures) == 1 else _gather(futures)
+
+    def stop(self) -> None:
+        for task in self._workers.values():
+            task.cancel()
+        self._workers.clear()
+        for queue in self._queues.values():
+            for item in queue:
+                for future in item.futures:
+                    future.cancel()
+        self._queues.clear()
+        self.stats.queued = 0
+
+    def _pop(self, queue: deque[_Outgoing]) -> _Outgoing | None:
+        """Pop the next item that was not cancelled by its caller."""
+        while queue:
+            item = queue.popleft()
+            self.stats.queued -= 1
+            if item.pending():
+                return item
+        return None
+
+    def _next(self, queue: deque[_Outgoing]) -> _Outgoing | None:
+        item = self._pop(queue)
+        if item is None or not self.merge or self.max_length <= 0:
+            return item
+        while queue:
+            other = queue[0]
+            if not other.pending():
+                queue.popleft()
+                self.stats.queued -= 1
+                continue
+            if (
+                # parts of a split danmaku must not be joined with other danmaku
+                item.siblings
+                or other.siblings
+                or other.mode != item.mode
+                or other.reply_mid
+                or len(item.text) + 1 + len(other.text) > self.max_length
+            ):
+                break
+            queue.popleft()
+            self.stats.queued -= 1
+            self.stats.merged += 1
+            item = _Outgoing(
+                f"{item.text} {other.text}",
+                item.mode,
+                item.reply_mid,
+                item.futures + other.futures,
+                item.siblings + other.siblings,
+            )
+        return item
+
+    async def _run(self, room_id: int) -> None:
+        queue = self._queues[room_id]
+        bucket = self._room_buckets.get(room_id)
+        if bucket is None:
+            bucket = self._room_buckets[room_id] = TokenBucket(
+                self.room_rate, self.room_burst
+            )
+        try:
+            while (item := self._next(queue)) is not None:
+                await bucket.acquire()
+                await self.account_bucket.acquire()
+                if item.pending():
+                    item.finish(await self._send(room_id, item))
+        finally:
+            # no await between the last empty check and here, so put() either
+            # sees this worker running or starts a new one
+            self._queues.pop(room_id, None)
+            self._workers.pop(room_id, None)
+
+    async def _send(self, room_id: int, item: _Outgoing) -> Exception | None:
+        attempt = 0
+        while True:
+            try:
+                await self.sender(room_id, item.text, item.mode, item.reply_mid)
+            except ActionFailed as e:
+                if e.code not in THROTTLE_CODES or attempt >= self.retries:
+                    self.stats.failed += 1
+                    return e
+                delay = self.retry_delay * 2**attempt
+                delay = random.uniform(delay / 2, delay)
+                attempt += 1
+                self.stats.retried += 1
+                log(
+                    "DEBUG",
+                    f"Sending danmaku to room {room_id} throttled, "
+                    f"retrying in {delay:.1f}s",
+                )
+                await asyncio.sleep(delay)
+            except Exception as e:
+                self.stats.failed += 1
+                return e
+            else:
+                self.stats.sent += 1
+                return None
+
+
+def _gather(futures: list[asyncio.Future[None]]) -> asyncio.Future[None]:
+    """Combine the parts of a split danmaku, a failed part cancels the rest."""
+    result = asyncio.get_running_loop().create_future()
+
+    def done(future: asyncio.Future[None]) -> None:
+        if result.done():
+            return
+        if future.cancelled():
+            result.cancel()
+        elif (error := future.exception()) is not None:
+            result.set_exception(error)
+        elif all(f.done() for f in futures):
+            result.set_result(None)
+
+    def cancel(_: asyncio.Future[None]) -> None:
+        if result.cancelled() or result.exception() is not None:
+            for future in futures:
+                future.cancel()
+
+    for future in futures:
+        future.add_done_callback(done)
+    result.add_done_callback(cancel)
+    return result
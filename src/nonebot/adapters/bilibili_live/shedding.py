@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from enum import IntEnum
+
+from .log import log
+from .stats import LoadSheddingStats
+
+LAG_CHECK_INTERVAL = 0.5
+LAG_SMOOTHING = 0.3
+
+DEFAULT_LITE_COMMANDS: set[str] = {
+    "INTERACT_WORD",
+    "INTERACT_WORD_V2",
+    "LIKE_INFO_V3_CLICK",
+    "LIKE_INFO_V3_UPDATE",
+    "ONLINE_RANK_COUNT",
+    "WATCHED_CHANGE",
+}
+"""默认在事件循环延迟过高时降级处理的命令"""
+
+
+class LoadMode(IntEnum):
+    """负载模式，数值越大降级越多"""
+
+    FULL = 0
+    """解析所有命令"""
+    SAMPLE = 1
+    """低价值命令按比例抽样解析"""
+    DROP = 2
+    """低价值命令全部丢弃"""
+
+
+class LoadShedder:
+    """根据事件循环延迟自动降级低价值命令的解析
+
+    后台任务周期性地测量 `asyncio.sleep` 的实际耗时与预期的差值作为延迟，
+    平滑后延迟超过 `sample_lag` 时进入抽样模式，超过 `drop_lag` 时进入丢弃模式；
+    延迟回落到阈值的一半以下时逐级恢复。
+    """
+
+    def __init__(
+        self,
+        commands: set[str],
+        sample_lag: float,
+        drop_lag: float,
+        sample_every: int,
+        enabled: bool = True,
+    ) -> None:
+        self.commands = commands
+        self.thresholds = (sample_lag, drop_lag)
+        self.sample_every = max(1, sample_every)
+        self.enabled = enabled
+        self.mode = LoadMode.FULL
+        self.stats = LoadSheddingStats()
+        self._seen = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._monitor())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    def should_drop(self, cmd: str) -> bool:
+        """当前模式下是否应当跳过该命令的解析"""
+        if self.mode == LoadMode.FULL or cmd not in self.commands:
+            return False
+        if self.mode == LoadMode.SAMPLE:
+            self._seen += 1
+            if self._seen % self.sample_every == 0:
+                self.stats.sampled += 1
+                return False
+        self.stats.dropped += 1
+        return True
+
+    def update(self, lag: float) -> LoadMode:
+        """记录一次延迟测量值并按需切换模式"""
+        stats = self.stats
+        stats.lag = lag + (stats.lag - lag) * (1 - LAG_SMOOTHING)
+        stats.max_lag = max(stats.max_lag, lag)
+        mode = self.mode
+        while mode < LoadMode.DROP and stats.lag >= self.thresholds[mode]:
+            mode = LoadMode(mode + 1)
+        while mode > LoadMode.FULL and stats.lag < self.thresholds[mode - 1] / 2:
+            mode = LoadMode(mode - 1)
+        if mode != self.mode:
+            log(
+                "WARNING" if mode > self.mode else "INFO",
+                f"Event loop lag {stats.lag * 1000:.0f}ms, "
+                f"switching load mode from <y>{self.mode.name.lower()}</y> "
+                f"to <y>{mode.name.lower()}</y>",
+            )
+            self.mode = mode
+            stats.mode = mode.name.lower()
+            stats.mode_changes += 1
+            stats.entered[stats.mode] = stats.entered.get(stats.mode, 0) + 1
+            self._seen = 0
+        return mode
+
+    async def _monitor(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_CHECK_INTERVAL)
+            self.update(max(0.0, loop.time() - start - LAG_CHECK_INTERVAL))
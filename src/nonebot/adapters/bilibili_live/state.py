@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+from . import codec
+from .log import log
+
+STATE_VERSION = 1
+SAVE_DELAY = 1.0
+
+
+class StateStore:
+    """本地会话状态
+
+    保存 WBI 密钥、buvid3、直播间信息和开放平台场次等数据及其保存时间，
+    重启后在有效期内直接使用，跳过对应的请求。数据以 JSON 保存，写入时先写临时文件
+    再替换，避免中途退出导致文件损坏。`path` 为 `None` 时不读写文件。
+    """
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self._sections: dict[str, dict[str, dict[str, Any]]] = {}
+        self._save_handle: asyncio.TimerHandle | None = None
+
+    def __bool__(self) -> bool:
+        return self.path is not None
+
+    def load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = codec.loads(self.path.read_bytes())
+        except Exception as e:
+            # the decode errors differ between the JSON backends
+            log("WARNING", f"Failed to load state file {self.path}, ignored", e)
+            return
+        if not isinstance(data, dict) or data.get("version") != STATE_VERSION:
+            log("WARNING", f"Ignored state file {self.path} of another version")
+            return
+        self._sections = data.get("sections", {})
+
+    def get(self, section: str, key: str, max_age: float | None = None) -> Any:
+        """获取保存不超过 `max_age` 秒的数据，不存在或已过期时返回 `None`"""
+        entry = self._sections.get(section, {}).get(key)
+        if entry is None:
+            return None
+        if max_age is not None and time.time() - entry["time"] > max_age:
+            return None
+        return entry["value"]
+
+    def put(self, section: str, key: str, value: Any) -> None:
+        if self.path is None:
+            return
+        self._sections.setdefault(section, {})[key] = {
+            "time": time.time(),
+            "value": value,
+        }
+        self._schedule_save()
+
+    def touch(self, section: str, key: str) -> None:
+        """将数据的保存时间更新为当前时间"""
+        entry = self._sections.get(section, {}).get(key)
+        if entry is not None:
+            entry["time"] = time.time()
+            self._schedule_save()
+
+    def remove(self, section: str, key: str) -> None:
+        if self._sections.get(section, {}).pop(key, None) is not None:
+            self._schedule_save()
+
+    def save(self) -> None:
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self.path is None:
+            return
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            data = codec.dumps_bytes(
+                {"version": STATE_VERSION, "sections": self._sections}
+            )
+            # holds buvid3 and open platform auth bodies, keep it private
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.chmod(tmp, 0o600)
+            os.replace(tmp, self.path)
+        except (OSError, TypeError, ValueError) as e:
+            log("WARNING", f"Failed to save state file {self.path}", e)
+
+    def _schedule_save(self) -> None:
+        # batch the writes of a burst of updates, e.g. while starting up
+        if self._save_handle is None:
+            self._save_handle = asyncio.get_running_loop().call_later(
+                SAVE_DELAY, self.save
+            )
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+
+
+@dataclass
+class DecodeStats:
+    """解码统计"""
+
+    frames: int = 0
+    """收到的 WebSocket 帧数"""
+    packets: int = 0
+    """拆包得到的数据包数（含压缩包内的子包）"""
+    decoded: int = 0
+    """完整解析为事件的数据包数"""
+    skipped_unknown: int = 0
+    """因命令没有对应事件而跳过解析的数据包数"""
+    skipped_filtered: int = 0
+    """因命令被用户过滤而跳过解析的数据包数"""
+    skipped_elided: int = 0
+    """因没有事件响应器能够处理而跳过的数据包数"""
+    skipped_shed: int = 0
+    """因负载降级而跳过解析的数据包数"""
+    skipped_bytes: int = 0
+    """跳过解析的数据包总字节数"""
+    validator_warmup: float | None = None
+    """启动时预热事件校验器的耗时（秒），尚未完成时为 `None`"""
+
+    @property
+    def skipped(self) -> int:
+        return (
+            self.skipped_unknown
+            + self.skipped_filtered
+            + self.skipped_elided
+            + self.skipped_shed
+        )
+
+
+@dataclass
+class RoomDispatchStats:
+    """直播间事件队列统计"""
+
+    depth: int = 0
+    """当前队列长度"""
+    max_depth: int = 0
+    """队列长度峰值"""
+    enqueued: int = 0
+    """入队的事件数"""
+    handled: int = 0
+    """处理完成的事件数"""
+    dropped: int = 0
+    """因队列溢出被丢弃的事件数"""
+
+
+@dataclass
+class LatencyRecorder:
+    """记录最近若干个延迟样本并计算分位数"""
+
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+    count: int = 0
+    """记录过的样本总数"""
+
+    def record(self, value: float) -> None:
+        self.samples.append(value)
+        self.count += 1
+
+    def percentiles(self, percentiles: tuple[float, ...]) -> dict[float, float]:
+        if not self.samples:
+            return {}
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        return {p: ordered[min(last, round(p / 100 * last))] for p in percentiles}
+
+
+@dataclass
+class LoadSheddingStats:
+    """负载降级统计"""
+
+    mode: str = "full"
+    """当前负载模式"""
+    lag: float = 0.0
+    """平滑后的事件循环延迟（秒）"""
+    max_lag: float = 0.0
+    """事件循环延迟峰值（秒）"""
+    mode_changes: int = 0
+    """负载模式切换次数"""
+    entered: dict[str, int] = field(default_factory=dict)
+    """进入各负载模式的次数"""
+    dropped: int = 0
+    """因降级被丢弃的数据包数"""
+    sampled: int = 0
+    """降级抽样时仍被解析的数据包数"""
+
+
+@dataclass
+class DedupeStats:
+    """消息去重统计"""
+
+    hits: int = 0
+    """因 `msg_id` 重复被丢弃的事件数"""
+    misses: int = 0
+    """首次出现的 `msg_id` 数"""
+    evicted: int = 0
+    """因超出容量被淘汰的 `msg_id` 数"""
+    size: int = 0
+    """当前记录的 `msg_id` 总数"""
+
+
+@dataclass
+class MirrorStats:
+    """冗余连接统计"""
+
+    forwarded: int = 0
+    """交给后续处理的数据包数"""
+    duplicates: int = 0
+    """因另一条连接已收到而丢弃的数据包数"""
+    evicted: int = 0
+    """因超出容量被淘汰的待匹配数据包数"""
+    expired: int = 0
+    """超过时间窗口仍未匹配而过期的数据包数"""
+    connected: int = 0
+    """当前已连接的连接数"""
+    failovers: int = 0
+    """一条连接断开而另一条仍在线的次数"""
+
+
+@dataclass
+class HostStats:
+    """弹幕服务器统计"""
+
+    rtt: float | None = None
+    """平滑后的 TCP 连接耗时（秒），用于排序，尚未测量时为 `None`"""
+    probed: float | None = None
+    """最近一次测量 TCP 连接耗时的时间（`time.monotonic()`）"""
+    handshake_rtt: float | None = None
+    """平滑后的 WebSocket 认证握手耗时（秒），仅用于统计"""
+    connects: int = 0
+    """成功建立连接的次数"""
+    failures: int = 0
+    """连接失败或过早断开的总次数"""
+    consecutive_failures: int = 0
+    """最近连续失败的次数，成功连接后清零"""
+
+
+@dataclass
+class ConnectionStatus:
+    """直播间连接状态"""
+
+    state: str = "idle"
+    """当前状态，见 `supervisor.ConnectionState`"""
+    since: float = 0.0
+    """进入当前状态的时间戳"""
+    connects: int = 0
+    """成功连接的次数"""
+    failures: int = 0
+    """连接失败或过早断开的总次数"""
+    attempts: int = 0
+    """最近连续失败的次数，决定下一次重连的等待时长"""
+    last_error: str | None = None
+    """最近一次失败的原因"""
+    next_retry: float | None = None
+    """下一次重连的时间戳，不在等待重连时为 `None`"""
+
+
+@dataclass
+class StartupStats:
+    """启动耗时统计，时间均为距适配器启动的秒数"""
+
+    started: float | None = None
+    """适配器启动的时间（`time.monotonic()`），尚未启动时为 `None`"""
+    logins: dict[str, float] = field(default_factory=dict)
+    """各 Bot 完成登录的时间"""
+    first_events: dict[int, float] = field(default_factory=dict)
+    """各直播间收到第一个事件的时间"""
+
+
+@dataclass
+class CacheStats:
+    """缓存统计"""
+
+    hits: int = 0
+    """命中未过期缓存的次数"""
+    misses: int = 0
+    """实际发起请求的次数"""
+    coalesced: int = 0
+    """等待同一个键正在进行的请求而未重复请求的次数"""
+
+
+@dataclass
+class SendStats:
+    """弹幕发送统计"""
+
+    queued: int = 0
+    """当前排队等待发送的弹幕数"""
+    sent: int = 0
+    """实际发送成功的请求数"""
+    merged: int = 0
+    """与前一条合并发送的弹幕数"""
+    split: int = 0
+    """因超长被拆分的弹幕数"""
+    retried: int = 0
+    """因发送过快被限制而重试的次数"""
+    failed: int = 0
+    """最终发送失败的请求数"""
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import random
+import time
+from typing import Literal
+
+from .log import log
+from .ratelimit import TokenBucket
+from .stats import ConnectionStatus
+
+ConnectionState = Literal[
+    "idle", "authenticating", "connecting", "connected", "backoff", "stopped"
+]
+
+
+class Supervisor:
+    """统一管理所有直播间连接
+
+    每个连接都有一个 `ConnectionStatus` 记录其状态。获取连接信息受全局令牌桶和
+    并发数限制，建立连接受全局并发数限制；连接断开后按连续失败次数指数退避，并加入随机抖动，
+    避免大量直播间在上游故障恢复时同时重连触发风控。
+    """
+
+    def __init__(
+        self,
+        base_delay: float,
+        max_delay: float,
+        max_connects: int,
+        max_auths: int,
+        rate: float = 0,
+        burst: int = 1,
+    ) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_connects = max_connects
+        self.max_auths = max_auths
+        self.connections: dict[str, ConnectionStatus] = {}
+        self.bucket = TokenBucket(rate, burst)
+        # created on first use so they bind to the running loop on Python 3.9
+        self._connects: asyncio.Semaphore | None = None
+        self._auths: asyncio.Semaphore | None = None
+
+    def register(self, key: str) -> ConnectionStatus:
+        status = self.connections.get(key)
+        if status is None:
+            status = self.connections[key] = ConnectionStatus(since=time.time())
+        return status
+
+    def set_state(self, status: ConnectionStatus, state: ConnectionState) -> None:
+        status.state = state
+        status.since = time.time()
+        if state != "backoff":
+            status.next_retry = None
+
+    def summary(self) -> dict[str, int]:
+        """各状态的连接数"""
+        return dict(Counter(status.state for status in self.connections.values()))
+
+    @asynccontextmanager
+    async def throttle(self) -> AsyncIterator[None]:
+        """发起登录、获取直播间信息等请求，受全局令牌桶和并发数限制"""
+        if self._auths is None:
+            self._auths = asyncio.Semaphore(self.max_auths)
+        await self.bucket.acquire()
+        async with self._auths:
+            yield
+
+    @asynccontextmanager
+    async def authenticating(self, status: ConnectionStatus) -> AsyncIterator[None]:
+        """获取连接信息"""
+        self.set_state(status, "authenticating")
+        async with self.throttle():
+            yield
+
+    @asynccontextmanager
+    async def connecting(self, status: ConnectionStatus) -> AsyncIterator[None]:
+        """建立连接，受全局并发数限制"""
+        self.set_state(status, "connecting")
+        if self._connects is None:
+            self._connects = asyncio.Semaphore(self.max_connects)
+        async with self._connects:
+            yield
+
+    def connected(self, status: ConnectionStatus) -> None:
+        status.connects += 1
+        self.set_state(status, "connected")
+
+    def recovered(self, status: ConnectionStatus) -> None:
+        """连接稳定运行了一段时间后断开，重新从最短的等待时长开始"""
+        status.attempts = 0
+
+    def failed(self, status: ConnectionStatus, error: str) -> None:
+        status.failures += 1
+        status.attempts += 1
+        status.last_error = error
+
+    def delay(self, attempts: int) -> float:
+        """连续失败 `attempts` 次后的等待时长，在上限的一半到上限之间随机"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** min(attempts, 32))
+        return random.uniform(ceiling / 2, ceiling)
+
+    async def backoff(self, key: str, status: ConnectionStatus) -> None:
+        delay = self.delay(status.attempts)
+        self.set_state(status, "backoff")
+        status.next_retry = time.time() + delay
+        log("DEBUG", f"Connection {key} reconnecting in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+    def stop(self, status: ConnectionStatus, error: str | None = None) -> None:
+        if error is not None:
+            status.last_error = error
+        self.set_state(status, "stopped")
+
+    def clear(self) -> None:
+        self.connections.clear()
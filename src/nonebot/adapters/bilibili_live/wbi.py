@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from functools import reduce
+from functools import lru_cache
 import hashlib
 import time
 from typing import Any
@@ -76,9 +76,13 @@ MIXIN_KEY_ENC_TAB = [
 ]
 
 
+_SIGN_STRIP = str.maketrans("", "", "!'()*")
+
+
+@lru_cache(maxsize=64)
 def get_mixin_key(img_key: str, sub_key: str) -> str:
     mix = img_key + sub_key
-    return reduce(lambda s, i: s + mix[i], MIXIN_KEY_ENC_TAB, "")[:32]
+    return "".join(mix[i] for i in MIXIN_KEY_ENC_TAB[:32])
 
 
 def get_key(key: str) -> str:
@@ -91,10 +95,7 @@ def wbi_encode(params: dict[str, Any], img_key: str, sub_key: str) -> dict[str,
     mixin_key = get_mixin_key(img_key, sub_key)
     params["wts"] = round(time.time())
     params = dict(sorted(params.items()))
-    params = {
-        k: "".join(filter(lambda chr: chr not in "!'()*", str(v)))
-        for k, v in params.items()
-    }
+    params = {k: str(v).translate(_SIGN_STRIP) for k, v in params.items()}
     query = urllib.parse.urlencode(params)
     wbi_sign = hashlib.md5((query + mixin_key).encode()).hexdigest()
     params["w_rid"] = wbi_sign
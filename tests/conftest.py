@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import nonebot.adapters
+
+# nonebot.adapters is a regular package, so an editable install of src/ is not
+# picked up on its own
+_ADAPTERS = Path(__file__).parent.parent / "src" / "nonebot" / "adapters"
+if str(_ADAPTERS) not in nonebot.adapters.__path__:
+    nonebot.adapters.__path__.append(str(_ADAPTERS))
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+from nonebot.adapters.bilibili_live.adapter import _WebApiAdapterMixin
+from nonebot.adapters.bilibili_live.supervisor import Supervisor
+
+ROOM_ID = 1
+
+
+def test_room_info_failure_is_retried() -> None:
+    calls: list[str] = []
+
+    async def get_buvid3(bot: object) -> str:
+        calls.append("buvid3")
+        if len(calls) == 1:
+            raise RuntimeError("-352")
+        return "buvid3"
+
+    async def get_room(bot: object, room_id: int) -> SimpleNamespace:
+        calls.append("room")
+        return SimpleNamespace(room_id=room_id)
+
+    bot = SimpleNamespace(self_id="1", cookie={}, rooms={}, room_event_filters={})
+    # the bot already listens to the room, so it returns once the room is known
+    adapter = SimpleNamespace(
+        supervisor=Supervisor(0, 0, 1, 1),
+        room_bots={ROOM_ID: [bot]},
+        _get_buvid3=get_buvid3,
+        _get_room=get_room,
+    )
+
+    async def main() -> None:
+        await asyncio.wait_for(
+            _WebApiAdapterMixin._listen_room_web(adapter, bot, ROOM_ID),  # pyright: ignore[reportArgumentType]
+            1,
+        )
+
+    asyncio.run(main())
+    assert calls == ["buvid3", "buvid3", "room"]
+    assert bot.rooms[ROOM_ID].room_id == ROOM_ID
+    assert not adapter.supervisor.connections
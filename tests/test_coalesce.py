@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from nonebot.adapters.bilibili_live.coalesce import _Batch, _Combo
+from nonebot.adapters.bilibili_live.event import (
+    GiftComboCompletedEvent,
+    WatchedChangeBatchEvent,
+    WatchedChangeEvent,
+    get_validator,
+)
+
+ROOM_ID = 1
+
+
+def watched(num: int) -> WatchedChangeEvent:
+    data = {"num": num, "text_small": str(num), "text_large": f"{num}人看过"}
+    event = get_validator(WatchedChangeEvent)({"room_id": ROOM_ID, "data": data})
+    assert isinstance(event, WatchedChangeEvent)
+    return event
+
+
+def test_batch_builds_event_model() -> None:
+    batch = _Batch(None)  # pyright: ignore[reportArgumentType]
+    batch.add(watched(1))
+    batch.add(watched(2))
+    event = batch.to_event(ROOM_ID)
+    assert isinstance(event, WatchedChangeBatchEvent)
+    assert (event.count, event.num) == (2, 2)
+
+
+def test_combo_builds_event_model() -> None:
+    # _Combo only reads these attributes of the gift events
+    gift = SimpleNamespace(
+        uid=1,
+        uname="user",
+        open_id="",
+        gift_name="gift",
+        num=2,
+        price=0.1,
+        timestamp=100,
+    )
+    combo = _Combo(None, gift)  # pyright: ignore[reportArgumentType]
+    combo.add(gift, 5)  # pyright: ignore[reportArgumentType]
+    combo.add(gift, 5)  # pyright: ignore[reportArgumentType]
+    event = combo.to_event("combo", ROOM_ID)
+    assert isinstance(event, GiftComboCompletedEvent)
+    assert (event.count, event.total_num) == (2, 4)
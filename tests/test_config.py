@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from nonebot.adapters.bilibili_live.config import Config
+
+from pydantic import ValidationError
+import pytest
+
+
+@pytest.mark.parametrize(
+    "field", ["bilibili_live_dispatch_workers", "bilibili_live_room_queue_size"]
+)
+def test_dispatch_sizes_must_be_positive(field: str) -> None:
+    with pytest.raises(ValidationError):
+        Config(**{field: 0})
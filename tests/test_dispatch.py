@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+
+from nonebot.adapters.bilibili_live.dispatch import Dispatcher
+
+# priority_of only looks at class names, so bare stand-ins are enough here
+SuperChatEvent = type("SuperChatEvent", (), {})
+DanmakuEvent = type("DanmakuEvent", (), {})
+LikeEvent = type("LikeEvent", (), {})
+
+ROOM_ID = 1
+
+
+def queued(dispatcher: Dispatcher) -> list[str]:
+    room = dispatcher.rooms[ROOM_ID]
+    return [
+        type(item.event).__name__
+        for _, queue in sorted(enumerate(room.queues))
+        for item in queue
+    ]
+
+
+async def fill(dispatcher: Dispatcher, *events: object) -> None:
+    for event in events:
+        await dispatcher.put(None, event, ROOM_ID)  # pyright: ignore[reportArgumentType]
+
+
+def test_drop_low_priority_keeps_higher_queued_events() -> None:
+    async def main() -> list[str]:
+        # no workers, so nothing leaves the queue
+        dispatcher = Dispatcher(0, 2, "drop_low_priority")
+        await fill(dispatcher, SuperChatEvent(), SuperChatEvent(), DanmakuEvent())
+        assert dispatcher.rooms[ROOM_ID].stats.dropped == 1
+        return queued(dispatcher)
+
+    assert asyncio.run(main()) == ["SuperChatEvent", "SuperChatEvent"]
+
+
+def test_drop_low_priority_evicts_lower_queued_events() -> None:
+    async def main() -> list[str]:
+        dispatcher = Dispatcher(0, 2, "drop_low_priority")
+        await fill(dispatcher, LikeEvent(), SuperChatEvent(), DanmakuEvent())
+        return queued(dispatcher)
+
+    assert asyncio.run(main()) == ["SuperChatEvent", "DanmakuEvent"]
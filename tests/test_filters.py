@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from nonebot.adapters.bilibili_live.event import (
+    DanmakuEvent,
+    LikeBatchEvent,
+    LikeEvent,
+)
+from nonebot.adapters.bilibili_live.filters import EventFilter, EventFilterUnion
+
+DERIVED = {LikeEvent: (LikeBatchEvent,)}
+
+
+def test_include_derived_event_admits_source() -> None:
+    event_filter = EventFilter(include=["LikeBatchEvent"], derived=DERIVED)
+    assert event_filter.accepts_command("LIKE_INFO_V3_CLICK") is True
+    assert event_filter.wants("LIKE_INFO_V3_CLICK", LikeEvent)
+    # the likes themselves are still not delivered
+    assert not event_filter.accepts("LIKE_INFO_V3_CLICK", LikeEvent)
+    assert event_filter.accepts("LikeBatchEvent", LikeBatchEvent)
+    assert event_filter.accepts_command("DANMU_MSG") is False
+
+
+def test_exclude_derived_event() -> None:
+    event_filter = EventFilter(exclude=["LikeBatchEvent"], derived=DERIVED)
+    assert not event_filter.accepts("LikeBatchEvent", LikeBatchEvent)
+    assert not event_filter.accepts_derived(LikeEvent)
+    assert event_filter.accepts("LIKE_INFO_V3_CLICK", LikeEvent)
+
+
+def test_derived_names_are_known() -> None:
+    event_filter = EventFilter(
+        include=["LikeBatchEvent", "GiftComboCompletedEvent", "NoSuchEvent"]
+    )
+    assert event_filter.unknown_names() == {"NoSuchEvent"}
+
+
+def test_union_wants_derived_events() -> None:
+    union = EventFilterUnion(
+        [
+            EventFilter(include=["DanmakuEvent"], derived=DERIVED),
+            EventFilter(include=["LikeBatchEvent"], derived=DERIVED),
+        ]
+    )
+    assert union.wants("DANMU_MSG", DanmakuEvent)
+    assert union.wants("LIKE_INFO_V3_CLICK", LikeEvent)
+    assert not union.accepts("LIKE_INFO_V3_CLICK", LikeEvent)
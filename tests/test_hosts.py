@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import asyncio
+
+from nonebot.adapters.bilibili_live.hosts import HostSelector
+
+
+def test_probe_measures_rtt_and_closes_the_connection() -> None:
+    async def main() -> HostSelector:
+        done = asyncio.Event()
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            await reader.read()  # returns once the probe closes its side
+            writer.close()
+            done.set()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        selector = HostSelector()
+        async with server:
+            await selector.probe([{"host": "127.0.0.1", "wss_port": port}])
+            await asyncio.wait_for(done.wait(), 1)
+        return selector
+
+    selector = asyncio.run(main())
+    stats = next(iter(selector.hosts.values()))
+    assert stats.rtt is not None
+    assert not stats.failures
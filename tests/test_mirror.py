@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from nonebot.adapters.bilibili_live.mirror import RoomMirror
+from nonebot.adapters.bilibili_live.packet import OpCode, Packet
+
+HOST_A = {"host": "a.example.com", "wss_port": 443}
+HOST_B = {"host": "b.example.com", "wss_port": 443}
+
+
+def test_links_stay_on_different_hosts_after_reranking() -> None:
+    mirror = RoomMirror()
+    first, second = mirror.link(0), mirror.link(1)
+    assert first.choose_host([HOST_A, HOST_B]) is HOST_A
+    assert second.choose_host([HOST_A, HOST_B]) is HOST_B
+    # B became the faster host while the first link reconnects
+    assert first.choose_host([HOST_B, HOST_A]) is HOST_A
+    assert second.choose_host([HOST_B, HOST_A]) is HOST_B
+
+
+def test_links_share_the_only_host() -> None:
+    mirror = RoomMirror()
+    assert mirror.link(0).choose_host([HOST_A]) is HOST_A
+    assert mirror.link(1).choose_host([HOST_A]) is HOST_A
+
+
+def test_failover_keeps_packets_seen_by_the_dropped_link() -> None:
+    mirror = RoomMirror()
+    first, second = mirror.link(0), mirror.link(1)
+    packet = Packet.new_binary(OpCode.Command, 0, b'{"cmd":"DANMU_MSG"}')
+    assert first.accept(packet)
+    # the first link drops here, its copy reaches the second link afterwards
+    assert not second.accept(packet)
+    assert mirror.stats.duplicates == 1
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import asyncio
+
+from nonebot.adapters.bilibili_live.sendqueue import SendQueue
+
+ROOM_ID = 1
+
+
+async def send_all(queue_options: dict, *texts: str) -> list[str]:
+    sent: list[str] = []
+
+    async def sender(room_id: int, text: str, mode: int, reply_mid: int) -> None:
+        sent.append(text)
+
+    queue = SendQueue(
+        sender,
+        room_rate=0,
+        room_burst=1,
+        account_rate=0,
+        account_burst=1,
+        **queue_options,
+    )
+    await asyncio.gather(*(queue.put(ROOM_ID, text) for text in texts))
+    return sent
+
+
+def test_no_split_by_default() -> None:
+    text = "a" * 50
+    assert asyncio.run(send_all({}, text)) == [text]
+
+
+def test_split_parts_are_not_merged_with_other_danmaku() -> None:
+    sent = asyncio.run(send_all({"max_length": 4, "merge": True}, "aaaaaa", "b", "c"))
+    assert sent == ["aaaa", "aa", "b c"]
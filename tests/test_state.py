@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+import stat
+
+from nonebot.adapters.bilibili_live.state import StateStore
+
+
+def test_state_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+
+    async def main() -> None:
+        store = StateStore(path)
+        store.put("buvid3", "1", "直播")
+        store.save()
+
+    asyncio.run(main())
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    restored = StateStore(path)
+    restored.load()
+    assert restored.get("buvid3", "1") == "直播"
+
+
+def test_corrupted_state_is_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "state.json"
+    path.write_bytes(b"{not json")
+    store = StateStore(path)
+    store.load()
+    assert store.get("buvid3", "1") is None